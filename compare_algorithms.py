@@ -5,52 +5,228 @@ Compare results with the SSSP algorithm to identify correctness issues
 
 import sys
 sys.path.insert(0, '/mnt/project')
-import heapq
-from collections import defaultdict
+import math
+from heapq import heappush, heappop
 from sssp_concept import solve_sssp_directed_real_weights
+from graph_generator import build_csr
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as sp_dijkstra
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Set by the --reference flag: force the pure-Python Dijkstra even when SciPy
+# or Numba is available, for cross-checking the native implementations.
+USE_REFERENCE_DIJKSTRA = False
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _dijkstra_njit(offsets, heads, weights, n, source):
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        dist[source] = 0.0
+
+        # 4-ary min-heap over parallel key/vertex arrays. With lazy deletion
+        # there is at most one push per edge plus the source.
+        hkey = np.empty(len(heads) + 1)
+        hval = np.empty(len(heads) + 1, dtype=np.int64)
+        hkey[0] = 0.0
+        hval[0] = source
+        size = 1
+
+        while size > 0:
+            d = hkey[0]
+            u = hval[0]
+            size -= 1
+            if size > 0:
+                # Sift the last entry down from the root, picking the
+                # smallest of up to four children per level.
+                lk = hkey[size]
+                lv = hval[size]
+                i = 0
+                while True:
+                    c = 4 * i + 1
+                    if c >= size:
+                        break
+                    m = c
+                    for j in range(c + 1, min(c + 4, size)):
+                        if hkey[j] < hkey[m]:
+                            m = j
+                    if hkey[m] < lk:
+                        hkey[i] = hkey[m]
+                        hval[i] = hval[m]
+                        i = m
+                    else:
+                        break
+                hkey[i] = lk
+                hval[i] = lv
+
+            if d != dist[u]:
+                continue
+            for idx in range(offsets[u], offsets[u + 1]):
+                v = heads[idx]
+                nd = d + weights[idx]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    # Sift up from the new leaf; parent of i is (i - 1) // 4
+                    i = size
+                    size += 1
+                    while i > 0:
+                        p = (i - 1) >> 2
+                        if nd < hkey[p]:
+                            hkey[i] = hkey[p]
+                            hval[i] = hval[p]
+                            i = p
+                        else:
+                            break
+                    hkey[i] = nd
+                    hval[i] = v
+        return dist, pred
+
+def numba_dijkstra(n, edges, source):
+    """Dijkstra via the Numba-compiled `_dijkstra_njit` (4-ary array heap) over a CSR built from the edges.
+
+    Same return convention as `dijkstra`: (dist, pred) lists indexed by vertex.
+    """
+    # build_csr collapses parallel edges the way the solver does (last weight wins)
+    offsets, heads, weights = build_csr(edges, n)
+    dist_arr, pred_arr = _dijkstra_njit(offsets, heads.astype(np.int64), weights, n, np.int64(source))
+
+    dist = dist_arr.tolist()
+    pred = [p if p >= 0 else None for p in pred_arr.tolist()]
+    return dist, pred
+
+def scipy_dijkstra(n, edges, source, want_pred=True):
+    """Dijkstra via scipy.sparse.csgraph on a CSR matrix built from the edges.
+
+    Same return convention as `dijkstra`: (dist, pred) lists indexed by vertex.
+    """
+    # build_csr leaves one entry per (u, v), with the last weight as the solver
+    # uses, so csr_matrix has no duplicates to sum
+    offsets, heads, weights = build_csr(edges, n)
+    G = csr_matrix((weights, heads, offsets), shape=(n, n))
+    if not want_pred:
+        dist_arr = sp_dijkstra(csgraph=G, directed=True, indices=source)
+        return dist_arr.tolist(), None
+
+    dist_arr, pred_arr = sp_dijkstra(csgraph=G, directed=True, indices=source,
+                                     return_predecessors=True)
+
+    dist = dist_arr.tolist()
+    pred = [p if p >= 0 else None for p in pred_arr.tolist()]
+    return dist, pred
+
+def dijkstra(n, edges, source, targets=None, want_pred=True):
+    """Standard Dijkstra's algorithm - O(m + n log n) time
+
+    Delegates to `scipy_dijkstra` when SciPy is installed, or `numba_dijkstra`
+    when Numba is, unless USE_REFERENCE_DIJKSTRA is set.
 
-def dijkstra(n, edges, source):
-    """Standard Dijkstra's algorithm - O(m + n log n) time"""
-    # Build adjacency list
-    graph = defaultdict(dict)
+    Uses lazy deletion instead of decrease-key: an entry is only pushed on a
+    strict improvement, and stale entries are skipped when popped.
+
+    Returns (dist, pred) as lists indexed by vertex; unreachable vertices keep
+    dist == inf and pred == None.
+
+    If `targets` (a set of vertices) is given, the search stops as soon as all
+    of them are settled; only their dist/pred entries are then guaranteed
+    final. The native backends always run the full search.
+
+    With `want_pred=False` predecessors are not recorded and pred is None.
+    """
+    if not USE_REFERENCE_DIJKSTRA:
+        if HAS_SCIPY:
+            return scipy_dijkstra(n, edges, source, want_pred)
+        if HAS_NUMBA:
+            dist, pred = numba_dijkstra(n, edges, source)
+            return dist, (pred if want_pred else None)
+
+    # Build adjacency; a repeated (u, v) keeps its last weight, as in the solver
+    adj = [{} for _ in range(n)]
     for u, v, w in edges:
-        graph[u][v] = w
+        adj[u][v] = w
+
+    # Local aliases skip the global lookups in the hot loop
+    _push = heappush
+    _pop = heappop
 
     # Initialize
-    dist = {source: 0.0}
-    pred = {source: None}
+    dist = [math.inf] * n
+    pred = [None] * n if want_pred else None
+    dist[source] = 0.0
+    # Heap entries stay (dist, vertex) tuples; see the note in
+    # scripts/compare_multiple.py. `_dijkstra_njit` uses flat arrays instead.
     pq = [(0.0, source)]
-    visited = set()
+    remaining = set(targets) if targets is not None else None
 
     while pq:
-        d, u = heapq.heappop(pq)
+        d, u = _pop(pq)
 
-        if u in visited:
+        # Stale entry: a shorter path to u was already settled
+        if d != dist[u]:
             continue
-        visited.add(u)
+
+        # Early exit once every requested target is settled
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
 
         # Relax outgoing edges
-        for v, w in graph[u].items():
-            new_dist = d + w
-            if new_dist < dist.get(v, float('inf')):
-                dist[v] = new_dist
-                pred[v] = u
-                heapq.heappush(pq, (new_dist, v))
+        for v, w in adj[u].items():
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                if want_pred:
+                    pred[v] = u
+                _push(pq, (nd, v))
 
     return dist, pred
 
 def reconstruct_path(pred, source, target):
     """Reconstruct path from source to target"""
-    if target not in pred:
+    if target != source and pred[target] is None:
         return None
     path = []
     curr = target
     while curr is not None:
         path.append(curr)
-        curr = pred.get(curr)
+        curr = pred[curr]
     path.reverse()
     return path
 
+def reconstruct_all_paths(pred, source):
+    """Reconstruct the path to every vertex in one pass over the pred tree.
+
+    Each path is its predecessor's path plus one vertex, so vertices are
+    visited parents-first (BFS from source). Unreachable vertices get None.
+    """
+    n = len(pred)
+    children = [[] for _ in range(n)]
+    for v, p in enumerate(pred):
+        if p is not None:
+            children[p].append(v)
+
+    paths = [None] * n
+    paths[source] = [source]
+    queue = [source]
+    for u in queue:
+        for v in children[u]:
+            paths[v] = paths[u] + [v]
+            queue.append(v)
+    return paths
+
 def compare_algorithms(n, edges, source):
     """Compare Dijkstra with SSSP algorithm"""
     print("=" * 70)
@@ -82,9 +258,10 @@ def compare_algorithms(n, edges, source):
 
     all_vertices = set(range(n))
     mismatches = []
+    dijkstra_paths = reconstruct_all_paths(dijkstra_pred, source)
 
     for v in sorted(all_vertices):
-        dijk_dist = dijkstra_dist.get(v, float('inf'))
+        dijk_dist = dijkstra_dist[v]
         sssp_dist_val = sssp_dist.get(v, float('inf'))
 
         match = "✓" if abs(dijk_dist - sssp_dist_val) < 1e-9 else "✗"
@@ -94,7 +271,7 @@ def compare_algorithms(n, edges, source):
         sssp_str = f"{sssp_dist_val:.4f}" if sssp_dist_val != float('inf') else "unreachable"
 
         # Get path
-        path = reconstruct_path(dijkstra_pred, source, v)
+        path = dijkstra_paths[v]
         path_str = " -> ".join(map(str, path)) if path else "none"
 
         print(f"{v:<10} {dijk_str:<15} {sssp_str:<15} {match:<10} {path_str}")
@@ -109,7 +286,7 @@ def compare_algorithms(n, edges, source):
     print("SUMMARY")
     print("=" * 70)
 
-    dijkstra_reachable = len([v for v in dijkstra_dist if dijkstra_dist[v] != float('inf')])
+    dijkstra_reachable = len([d for d in dijkstra_dist if d != float('inf')])
     sssp_reachable = len([v for v in sssp_dist if sssp_dist[v] != float('inf')])
 
     print(f"Dijkstra found {dijkstra_reachable}/{n} reachable vertices")
@@ -127,6 +304,8 @@ def compare_algorithms(n, edges, source):
 
 # Test cases
 if __name__ == "__main__":
+    USE_REFERENCE_DIJKSTRA = '--reference' in sys.argv
+
     print("\n" + "="*70)
     print("TEST CASE 1: Simple Graph (from starter.py)")
     print("="*70)
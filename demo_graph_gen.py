@@ -29,7 +29,7 @@ def run_case(title: str, make_graph_fn, save_as: str, *args, **kwargs) -> None:
 
     # Generate in-memory graph and edges
     graph, edges = make_graph_fn(*args, **kwargs)
-    n = len(graph)
+    n = graph.n
     m = len(edges)
 
     # Save to file
@@ -6,13 +6,131 @@ in the format expected by the sssp_concept.py implementation.
 
 The algorithm expects:
 - Vertex IDs: integers from 0 to n-1
-- Graph format: Dict[int, Dict[int, float]] (adjacency list)
-- Edges: directed with non-negative weights
+- Edges: directed with non-negative weights, as a list of (u, v, weight)
+
+Alongside the edge list each generator returns the adjacency as a CSRGraph
+(indptr, indices, weights): NumPy arrays when NumPy is installed, plain lists
+otherwise. Each generator draws from its own random.Random(seed), leaving the
+global random state alone; seed=None seeds it from the OS.
 """
 
 import random
 import math
-from typing import Dict, List, Tuple
+import mmap
+import struct
+import sys
+from array import array
+from operator import itemgetter
+from typing import List, NamedTuple, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+class CSRGraph(NamedTuple):
+    """
+    Compressed sparse row adjacency. The out-edges of u are
+    indices[indptr[u]:indptr[u+1]] with matching weights[indptr[u]:indptr[u+1]].
+    """
+    indptr: Sequence[int]
+    indices: Sequence[int]
+    weights: Sequence[float]
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+
+# Structured dtype for edge arrays: one (u, v, w) record per edge
+EDGE_DTYPE = [('u', 'i4'), ('v', 'i4'), ('w', 'f8')]
+
+
+def build_csr(edges: List[Tuple[int, int, float]], n: int) -> CSRGraph:
+    """
+    Build a CSRGraph from an edge list.
+
+    Edges are grouped by source, each vertex keeping its out-edges in input
+    order. Parallel edges collapse as in sssp_concept's solver: a repeated
+    (u, v) keeps the position of its first occurrence and the weight of its
+    last one, so reference Dijkstras on this CSR agree with the solver.
+
+    Args:
+        edges: List of edges (u, v, weight), or a structured array with
+            'u', 'v' and 'w' fields (EDGE_DTYPE), which is read without copying
+        n: Number of vertices
+
+    Returns:
+        CSRGraph with int64 indptr, int32 indices and float64 weights (lists
+        without NumPy)
+    """
+    if HAS_NUMPY:
+        if isinstance(edges, np.ndarray):
+            arr = edges
+        else:
+            arr = np.array(edges, dtype=EDGE_DTYPE)
+        u, v, w = arr['u'], arr['v'], arr['w']
+        # Runs of equal (u, v) in a stable key sort: first and last occurrence of each
+        key = u.astype(np.int64) * n + v
+        by_key = np.argsort(key, kind='stable')
+        sorted_key = key[by_key]
+        new_run = np.ones(len(key), dtype=bool)
+        new_run[1:] = sorted_key[1:] != sorted_key[:-1]
+        run_end = np.ones(len(key), dtype=bool)
+        run_end[:-1] = new_run[1:]
+        first, last = by_key[new_run], by_key[run_end]
+        # Group by source, rows in first-occurrence order
+        order = np.lexsort((first, u[first]))
+        keep = first[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u[keep], minlength=n), out=indptr[1:])
+        return CSRGraph(indptr, v[keep], w[last[order]])
+
+    # Per-source dicts: a repeated v keeps its slot and takes the new weight
+    rows = [{} for _ in range(n)]
+    for u, v, w in edges:
+        rows[u][v] = w
+    indptr = [0] * (n + 1)
+    indices: List[int] = []
+    weights: List[float] = []
+    for u, row in enumerate(rows):
+        indices.extend(row)
+        weights.extend(row.values())
+        indptr[u + 1] = len(indices)
+    return CSRGraph(indptr, indices, weights)
+
+
+def _reachable_mask(graph: CSRGraph, source: int) -> List[bool]:
+    """Which vertices `source` reaches in `graph`: one SciPy BFS, or a Python BFS without SciPy."""
+    n = graph.n
+    if HAS_SCIPY and HAS_NUMPY:
+        matrix = csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n))
+        mask = np.zeros(n, dtype=bool)
+        mask[breadth_first_order(matrix, source, directed=True, return_predecessors=False)] = True
+        return mask.tolist()
+
+    indptr, indices = graph.indptr, graph.indices
+    if HAS_NUMPY:
+        indptr, indices = indptr.tolist(), indices.tolist()
+    seen = [False] * n
+    seen[source] = True
+    stack = [source]
+    while stack:
+        u = stack.pop()
+        for v in indices[indptr[u]:indptr[u + 1]]:
+            if not seen[v]:
+                seen[v] = True
+                stack.append(v)
+    return seen
 
 
 def generate_random_graph(
@@ -20,9 +138,9 @@ def generate_random_graph(
     m: int,
     min_weight: float = 0.1,
     max_weight: float = 10.0,
-    connected: bool = True,
+    connected: Union[bool, str] = True,
     seed: int = None
-) -> Tuple[Dict[int, Dict[int, float]], List[Tuple[int, int, float]]]:
+) -> Tuple[CSRGraph, List[Tuple[int, int, float]]]:
     """
     Generate a random directed graph.
     
@@ -31,16 +149,21 @@ def generate_random_graph(
         m: Number of edges
         min_weight: Minimum edge weight
         max_weight: Maximum edge weight
-        connected: If True, ensures graph is weakly connected from vertex 0
+        connected: If True, ensures every vertex is reachable from vertex 0
+            by starting from a random spanning tree. 'probable' draws all m
+            edges at random instead, checks reachability from vertex 0 once,
+            and gives each vertex still unreached an edge from a random
+            reached vertex (so slightly more than m edges may come back).
+            Both modes are deterministic for a given seed, but produce
+            different graphs from each other.
         seed: Random seed for reproducibility
         
     Returns:
-        Tuple of (graph_dict, edges_list)
-        - graph_dict: Adjacency list format {u: {v: weight}}
+        Tuple of (graph, edges_list)
+        - graph: CSRGraph adjacency
         - edges_list: List of tuples (u, v, weight)
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
     
     if m < n - 1 and connected:
         raise ValueError(f"Cannot create connected graph with {n} vertices and only {m} edges. Need at least {n-1} edges.")
@@ -48,51 +171,87 @@ def generate_random_graph(
     if m > n * (n - 1):
         raise ValueError(f"Too many edges. Maximum for {n} vertices is {n * (n - 1)}")
     
-    graph: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
     edges: List[Tuple[int, int, float]] = []
+    # Seen edges as packed u * n + v ints: one small int per edge instead of
+    # a (u, v) tuple holding two
     edge_set = set()
     
+    # randrange(k) and the inlined uniform() below consume the random stream
+    # exactly like choice() over k items / randint(0, k - 1) and
+    # uniform(min_weight, max_weight), so a seed still yields the same graph;
+    # they just skip the wrapper calls in these loops.
+    randrange = rng.randrange
+    rand = rng.random
+    weight_span = max_weight - min_weight
+    append = edges.append
+    mark = edge_set.add
+    
     # If connected, first create a spanning tree from vertex 0
-    if connected and n > 1:
+    if connected and connected != 'probable' and n > 1:
         # Create a random permutation of vertices
         vertices = list(range(1, n))
-        random.shuffle(vertices)
+        rng.shuffle(vertices)
         
-        # Connect each vertex to a random earlier vertex in the tree
+        # Connect each vertex to a random earlier vertex in the tree: the
+        # tree after i steps is the prefix tree_order[:i + 1], so index into
+        # it instead of rebuilding [0] + vertices[:i] every step
+        tree_order = [0] + vertices
         for i, v in enumerate(vertices):
-            # Choose a random vertex from 0 to current tree size
-            u = random.choice([0] + vertices[:i])
-            weight = random.uniform(min_weight, max_weight)
-            
-            graph[u][v] = weight
-            edges.append((u, v, weight))
-            edge_set.add((u, v))
+            u = tree_order[randrange(i + 1)]
+            append((u, v, min_weight + weight_span * rand()))
+            mark(u * n + v)
     
     # Add remaining random edges
-    edges_to_add = m - len(edges)
     attempts = 0
     max_attempts = m * 10
     
     while len(edges) < m and attempts < max_attempts:
-        u = random.randint(0, n - 1)
-        v = random.randint(0, n - 1)
+        u = randrange(n)
+        v = randrange(n)
         
         # No self-loops, no duplicate edges
-        if u != v and (u, v) not in edge_set:
-            weight = random.uniform(min_weight, max_weight)
-            graph[u][v] = weight
-            edges.append((u, v, weight))
-            edge_set.add((u, v))
+        if u != v:
+            key = u * n + v
+            if key not in edge_set:
+                append((u, v, min_weight + weight_span * rand()))
+                mark(key)
         
         attempts += 1
     
     if len(edges) < m:
         print(f"Warning: Could only generate {len(edges)} edges out of {m} requested")
     
-    return graph, edges
+    if connected == 'probable' and n > 1:
+        graph = build_csr(edges, n)
+        reached = _reachable_mask(graph, 0)
+        if all(reached):
+            return graph, edges
+        # Attach unreached vertices in id order; anything an attached vertex
+        # already reaches is marked too, so it doesn't get an edge of its own
+        indptr, indices = graph.indptr, graph.indices
+        if HAS_NUMPY:
+            indptr, indices = indptr.tolist(), indices.tolist()
+        reached_list = [v for v in range(n) if reached[v]]
+        for v in range(n):
+            if reached[v]:
+                continue
+            u = reached_list[randrange(len(reached_list))]
+            append((u, v, min_weight + weight_span * rand()))
+            reached[v] = True
+            reached_list.append(v)
+            stack = [v]
+            while stack:
+                x = stack.pop()
+                for y in indices[indptr[x]:indptr[x + 1]]:
+                    if not reached[y]:
+                        reached[y] = True
+                        reached_list.append(y)
+                        stack.append(y)
+    
+    return build_csr(edges, n), edges
 
 
-def generate_sparse_graph(n: int, avg_degree: float = 3.0, **kwargs) -> Tuple[Dict[int, Dict[int, float]], List[Tuple[int, int, float]]]:
+def generate_sparse_graph(n: int, avg_degree: float = 3.0, **kwargs) -> Tuple[CSRGraph, List[Tuple[int, int, float]]]:
     """
     Generate a sparse graph with approximately the specified average out-degree.
     
@@ -102,30 +261,64 @@ def generate_sparse_graph(n: int, avg_degree: float = 3.0, **kwargs) -> Tuple[Di
         **kwargs: Additional arguments passed to generate_random_graph
         
     Returns:
-        Tuple of (graph_dict, edges_list)
+        Tuple of (graph, edges_list)
     """
     m = int(n * avg_degree)
     return generate_random_graph(n, m, **kwargs)
 
 
-def generate_dense_graph(n: int, edge_probability: float = 0.3, **kwargs) -> Tuple[Dict[int, Dict[int, float]], List[Tuple[int, int, float]]]:
+def generate_dense_graph(
+    n: int,
+    edge_probability: float = 0.3,
+    min_weight: float = 0.1,
+    max_weight: float = 10.0,
+    seed: int = None
+) -> Tuple[CSRGraph, List[Tuple[int, int, float]]]:
     """
     Generate a dense graph where each possible edge exists with given probability.
     
+    Rather than drawing endpoints and rejecting duplicates, this walks the
+    n*(n-1) possible directed non-self edges in order and jumps straight to
+    the next kept one with a geometric gap (Batagelj & Brandes), so the work
+    is proportional to the edges produced.
+    
     Args:
         n: Number of vertices
         edge_probability: Probability of each edge existing (0 to 1)
-        **kwargs: Additional arguments passed to generate_random_graph
+        min_weight: Minimum edge weight
+        max_weight: Maximum edge weight
+        seed: Random seed
         
     Returns:
-        Tuple of (graph_dict, edges_list)
+        Tuple of (graph, edges_list)
     """
+    rng = random.Random(seed)
+    
+    edges: List[Tuple[int, int, float]] = []
     max_edges = n * (n - 1)
-    m = int(max_edges * edge_probability)
-    return generate_random_graph(n, m, **kwargs)
+    if edge_probability <= 0 or max_edges == 0:
+        return build_csr(edges, n), edges
+    
+    rand = rng.random
+    weight_span = max_weight - min_weight
+    # Position pos encodes edge (u, v): u = pos // (n-1), and v skips over u
+    log_q = math.log(1.0 - edge_probability) if edge_probability < 1 else None
+    pos = -1
+    while True:
+        if log_q is None:
+            pos += 1
+        else:
+            pos += 1 + int(math.log(1.0 - rand()) / log_q)
+        if pos >= max_edges:
+            break
+        u, r = divmod(pos, n - 1)
+        v = r + (r >= u)
+        edges.append((u, v, min_weight + weight_span * rand()))
+    
+    return build_csr(edges, n), edges
 
 
-def generate_path_graph(n: int, min_weight: float = 0.1, max_weight: float = 10.0, seed: int = None) -> Tuple[Dict[int, Dict[int, float]], List[Tuple[int, int, float]]]:
+def generate_path_graph(n: int, min_weight: float = 0.1, max_weight: float = 10.0, seed: int = None) -> Tuple[CSRGraph, List[Tuple[int, int, float]]]:
     """
     Generate a simple path graph 0 -> 1 -> 2 -> ... -> n-1
     
@@ -136,19 +329,22 @@ def generate_path_graph(n: int, min_weight: float = 0.1, max_weight: float = 10.
         seed: Random seed
         
     Returns:
-        Tuple of (graph_dict, edges_list)
+        Tuple of (graph, edges_list)
     """
-    if seed is not None:
-        random.seed(seed)
-    
-    graph: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
-    edges: List[Tuple[int, int, float]] = []
-    
-    for i in range(n - 1):
-        weight = random.uniform(min_weight, max_weight)
-        graph[i][i + 1] = weight
-        edges.append((i, i + 1, weight))
-    
+    rng = random.Random(seed)
+    rand = rng.random
+    weight_span = max_weight - min_weight
+    
+    num_edges = max(n - 1, 0)
+    weights = [min_weight + weight_span * rand() for _ in range(num_edges)]
+    edges: List[Tuple[int, int, float]] = list(zip(range(num_edges), range(1, n), weights))
+    
+    # The CSR is known up front: vertex i < n-1 owns edge i, the last vertex none
+    if HAS_NUMPY:
+        indptr = np.minimum(np.arange(n + 1, dtype=np.int64), num_edges)
+        graph = CSRGraph(indptr, np.arange(1, n, dtype=np.int32), np.array(weights, dtype=np.float64))
+    else:
+        graph = CSRGraph(list(range(n)) + [num_edges], list(range(1, n)), weights)
     return graph, edges
 
 
@@ -159,7 +355,7 @@ def generate_layered_graph(
     min_weight: float = 0.1,
     max_weight: float = 10.0,
     seed: int = None
-) -> Tuple[Dict[int, Dict[int, float]], List[Tuple[int, int, float]]]:
+) -> Tuple[CSRGraph, List[Tuple[int, int, float]]]:
     """
     Generate a layered DAG (directed acyclic graph).
     Edges only go from layer i to layer i+1.
@@ -173,32 +369,46 @@ def generate_layered_graph(
         seed: Random seed
         
     Returns:
-        Tuple of (graph_dict, edges_list)
+        Tuple of (graph, edges_list)
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
     
     n = num_layers * vertices_per_layer
-    graph: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
-    edges: List[Tuple[int, int, float]] = []
+    
+    # The per-vertex rng.sample call stays (it fixes the seed -> graph
+    # mapping); everything around it is hoisted out of the vertex loop
+    sample = rng.sample
+    rand = rng.random
+    weight_span = max_weight - min_weight
+    k = min(forward_edges_per_vertex, vertices_per_layer)
+    
+    # Every vertex outside the last layer has exactly k out-edges, emitted in
+    # vertex order, so the CSR columns are filled directly
+    indices: List[int] = []
+    weights: List[float] = []
+    add_target = indices.append
+    add_weight = weights.append
     
     for layer in range(num_layers - 1):
         layer_start = layer * vertices_per_layer
         next_layer_start = (layer + 1) * vertices_per_layer
+        next_layer = range(next_layer_start, next_layer_start + vertices_per_layer)
         
-        for i in range(vertices_per_layer):
-            u = layer_start + i
+        for u in range(layer_start, layer_start + vertices_per_layer):
             # Connect to random vertices in next layer
-            targets = random.sample(
-                range(next_layer_start, next_layer_start + vertices_per_layer),
-                min(forward_edges_per_vertex, vertices_per_layer)
-            )
-            
-            for v in targets:
-                weight = random.uniform(min_weight, max_weight)
-                graph[u][v] = weight
-                edges.append((u, v, weight))
-    
+            for v in sample(next_layer, k):
+                add_target(v)
+                add_weight(min_weight + weight_span * rand())
+    
+    num_sources = max(num_layers - 1, 0) * vertices_per_layer
+    sources = [u for u in range(num_sources) for _ in range(k)]
+    edges: List[Tuple[int, int, float]] = list(zip(sources, indices, weights))
+    
+    if HAS_NUMPY:
+        indptr = np.minimum(np.arange(n + 1, dtype=np.int64), num_sources) * k
+        graph = CSRGraph(indptr, np.array(indices, dtype=np.int32), np.array(weights, dtype=np.float64))
+    else:
+        graph = CSRGraph([min(u, num_sources) * k for u in range(n + 1)], indices, weights)
     return graph, edges
 
 
@@ -250,21 +460,120 @@ def load_graph_from_file(filename: str) -> Tuple[int, int, List[Tuple[int, int,
     return n, m, edges
 
 
-def edges_to_graph_dict(edges: List[Tuple[int, int, float]], n: int) -> Dict[int, Dict[int, float]]:
+# Binary edge-list layout (little-endian): a '<QQ' header with n and m, then
+# the u column as int32[m], the v column as int32[m] and weights as float64[m]
+BIN_HEADER = struct.Struct('<QQ')
+
+
+def _to_le(arr: array) -> array:
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+def save_graph_bin(edges: List[Tuple[int, int, float]], n: int, filename: str):
+    """
+    Save graph to a binary file (see BIN_HEADER for the layout).
+    
+    Each column is written with a single tofile call, so there is no
+    per-edge formatting; load it back with load_graph_bin.
+    
+    Args:
+        edges: List of edges (u, v, weight), or a structured array with
+            EDGE_DTYPE fields, whose columns are written without a Python loop
+        n: Number of vertices
+        filename: Output filename
+    """
+    m = len(edges)
+    
+    with open(filename, 'wb') as f:
+        f.write(BIN_HEADER.pack(n, m))
+        if HAS_NUMPY and isinstance(edges, np.ndarray):
+            for field, dtype in (('u', '<i4'), ('v', '<i4'), ('w', '<f8')):
+                np.ascontiguousarray(edges[field], dtype=dtype).tofile(f)
+        else:
+            _to_le(array('i', map(itemgetter(0), edges))).tofile(f)
+            _to_le(array('i', map(itemgetter(1), edges))).tofile(f)
+            _to_le(array('d', map(itemgetter(2), edges))).tofile(f)
+    
+    print(f"Graph saved to {filename}: {n} vertices, {m} edges")
+
+
+def load_graph_bin(filename: str) -> Tuple[int, int, List[Tuple[int, int, float]]]:
+    """
+    Load graph from a binary file written by save_graph_bin.
+    
+    Args:
+        filename: Input filename
+        
+    Returns:
+        Tuple of (n, m, edges)
+    """
+    with open(filename, 'rb') as f:
+        n, m = BIN_HEADER.unpack(f.read(BIN_HEADER.size))
+        us, vs, ws = array('i'), array('i'), array('d')
+        for col in (us, vs, ws):
+            col.fromfile(f, m)
+            _to_le(col)
+    
+    edges = list(zip(us, vs, ws))
+    print(f"Graph loaded from {filename}: {n} vertices, {len(edges)} edges")
+    return n, m, edges
+
+
+def mmap_graph_bin(filename: str) -> Tuple[int, int, Sequence[int], Sequence[int], Sequence[float]]:
+    """
+    Memory-map a binary graph file written by save_graph_bin.
+    
+    Nothing is copied or parsed: the u, v and weight columns are returned as
+    read-only views into the mapping (NumPy arrays when NumPy is installed,
+    memoryviews otherwise), so repeated runs on the same graph only touch
+    pages the OS already has cached. The mapping stays open while any view
+    is alive.
+    
+    Args:
+        filename: Input filename
+        
+    Returns:
+        Tuple of (n, m, u, v, weights)
+    """
+    with open(filename, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    n, m = BIN_HEADER.unpack_from(mm)
+    u_at = BIN_HEADER.size
+    v_at = u_at + 4 * m
+    w_at = v_at + 4 * m
+    
+    if HAS_NUMPY:
+        u = np.frombuffer(mm, dtype='<i4', count=m, offset=u_at)
+        v = np.frombuffer(mm, dtype='<i4', count=m, offset=v_at)
+        w = np.frombuffer(mm, dtype='<f8', count=m, offset=w_at)
+        return n, m, u, v, w
+    
+    if sys.byteorder == 'big':
+        # memoryview.cast only reads native byte order
+        mm.close()
+        _, _, edges = load_graph_bin(filename)
+        u, v, w = (list(col) for col in zip(*edges)) if edges else ([], [], [])
+        return n, m, u, v, w
+    
+    buf = memoryview(mm)
+    return (n, m, buf[u_at:v_at].cast('i'), buf[v_at:w_at].cast('i'),
+            buf[w_at:w_at + 8 * m].cast('d'))
+
+
+def edges_to_graph_dict(edges: List[Tuple[int, int, float]], n: int) -> CSRGraph:
     """
-    Convert edge list to adjacency list format.
+    Convert edge list to the adjacency format the generators return.
     
     Args:
         edges: List of edges (u, v, weight)
         n: Number of vertices
         
     Returns:
-        Adjacency list {u: {v: weight}}
+        CSRGraph (see build_csr)
     """
-    graph: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
-    for u, v, weight in edges:
-        graph[u][v] = weight
-    return graph
+    return build_csr(edges, n)
 
 
 # Example usage
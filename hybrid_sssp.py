@@ -13,141 +13,384 @@ This approach aims to get the best of both worlds:
 """
 
 import time
+import signal
+import threading
 import multiprocessing as mp
 import heapq
-from typing import Dict, List, Tuple, Set, Any
+from typing import Dict, List, Tuple, Set, Any, Union
 from collections import defaultdict
 
+from graph_generator import CSRGraph, HAS_NUMPY, build_csr
+import sssp_concept
 from sssp_concept import solve_sssp_directed_real_weights
 
+if HAS_NUMPY:
+    import numpy as np
 
-def dijkstra_single_source(graph_dict: Dict[int, Dict[int, float]], n: int, source: int) -> Dict[int, float]:
-    """Standard Dijkstra's algorithm for single-source shortest paths."""
-    dist = {source: 0.0}
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True, boundscheck=False)
+    def dijkstra_csr(indptr, indices, weights, n, source):
+        """Compiled Dijkstra over CSR arrays; returns a float64[n] dist array (inf = unreachable)."""
+        dist = np.full(n, np.inf)
+        visited = np.zeros(n, dtype=np.uint8)
+        dist[source] = 0.0
+
+        # Binary min-heap over parallel distance/vertex arrays. With lazy
+        # deletion there is at most one push per edge plus the source.
+        heap_d = np.empty(len(indices) + 1)
+        heap_v = np.empty(len(indices) + 1, dtype=np.int32)
+        heap_d[0] = 0.0
+        heap_v[0] = source
+        size = 1
+
+        while size > 0:
+            d = heap_d[0]
+            u = heap_v[0]
+            size -= 1
+            if size > 0:
+                # Sift the last entry down from the root
+                ld = heap_d[size]
+                lv = heap_v[size]
+                i = 0
+                while True:
+                    c = 2 * i + 1
+                    if c >= size:
+                        break
+                    if c + 1 < size and heap_d[c + 1] < heap_d[c]:
+                        c += 1
+                    if heap_d[c] < ld:
+                        heap_d[i] = heap_d[c]
+                        heap_v[i] = heap_v[c]
+                        i = c
+                    else:
+                        break
+                heap_d[i] = ld
+                heap_v[i] = lv
+
+            if visited[u]:
+                continue
+            visited[u] = 1
+
+            for idx in range(indptr[u], indptr[u + 1]):
+                v = indices[idx]
+                nd = d + weights[idx]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    # Sift up from the new leaf
+                    i = size
+                    size += 1
+                    while i > 0:
+                        p = (i - 1) >> 1
+                        if heap_d[p] <= nd:
+                            break
+                        heap_d[i] = heap_d[p]
+                        heap_v[i] = heap_v[p]
+                        i = p
+                    heap_d[i] = nd
+                    heap_v[i] = v
+        return dist
+
+
+# Set once dijkstra_csr has been loaded (or compiled) in this process
+_dijkstra_warm = False
+
+
+def _warm_dijkstra():
+    """
+    Run dijkstra_csr once on a two-vertex graph with the argument types
+    dijkstra_single_source passes, so the first timed call in a process does
+    not include loading the compiled kernel. No-op without Numba or when done.
+    """
+    global _dijkstra_warm
+    if HAS_NUMBA and not _dijkstra_warm:
+        dijkstra_csr(*build_csr([(0, 1, 1.0)], 2), 2, 0)
+        _dijkstra_warm = True
+
+
+def dijkstra_single_source(graph: CSRGraph, n: int, source: int) -> Dict[int, float]:
+    """
+    Standard Dijkstra's algorithm for single-source shortest paths over a CSR adjacency.
+
+    Runs the Numba-compiled `dijkstra_csr` when Numba is installed; the result
+    is the same {vertex: distance} dict of reachable vertices either way.
+    """
+    indptr, indices, weights = graph
+    if HAS_NUMBA:
+        dist_arr = dijkstra_csr(np.asarray(indptr), np.asarray(indices),
+                                np.asarray(weights, dtype=np.float64), n, source)
+        reached = np.flatnonzero(np.isfinite(dist_arr))
+        return dict(zip(reached.tolist(), dist_arr[reached].tolist()))
+
+    if HAS_NUMPY and isinstance(indptr, np.ndarray):
+        # Plain list indexing is much cheaper than NumPy scalar indexing in
+        # this interpreted loop
+        indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+
+    # Dense dist list instead of a dict plus visited set: a popped entry is
+    # stale exactly when it is worse than dist[u]. Heap entries stay
+    # (dist, vertex) tuples; packing both into one int key measured slower
+    # here (see scripts/compare_multiple.py).
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    inf = float('inf')
+    dist = [inf] * n
+    dist[source] = 0.0
     pq = [(0.0, source)]
-    visited = set()
     
     while pq:
-        d, u = heapq.heappop(pq)
+        d, u = heappop(pq)
         
-        if u in visited:
+        if d > dist[u]:
             continue
-        visited.add(u)
         
-        for v, w in graph_dict.get(u, {}).items():
-            new_dist = d + w
-            if new_dist < dist.get(v, float('inf')):
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            new_dist = d + weights[i]
+            if new_dist < dist[v]:
                 dist[v] = new_dist
-                heapq.heappush(pq, (new_dist, v))
+                heappush(pq, (new_dist, v))
     
-    return dist
+    return {v: d for v, d in enumerate(dist) if d != inf}
+
+
+# CSR per (edges object, n), so parameter sweeps that
+# call compare_algorithms repeatedly on one graph build it once. Entries
+# hold a reference to the edges object, which keeps its id from being reused;
+# edges must not be mutated in place between calls.
+_CSR_CACHE_SIZE = 8
+_csr_cache: Dict[Tuple[int, int], Tuple[Any, CSRGraph]] = {}
+
 
+def _prepare_graph(edges, n: int, graph: CSRGraph = None) -> Tuple[CSRGraph, Any]:
+    """
+    Return (CSR for Dijkstra, edges for the SSSP solver), cached per edges
+    object. A `graph` already built from `edges` is used instead of rebuilding it.
+    """
+    key = (id(edges), n)
+    entry = _csr_cache.get(key)
+    if entry is not None and entry[0] is edges:
+        return entry[1], edges
 
-def _sssp_worker(n: int, edges: List[Tuple[int, int, float]], source: int, q: mp.Queue):
-    """Worker function to run SSSP in a subprocess and return results via queue."""
+    # A structured edge array (graph_generator.EDGE_DTYPE) goes straight into
+    # both the CSR build and the SSSP solver
+    if graph is None:
+        graph = build_csr(edges, n)
+    if len(_csr_cache) >= _CSR_CACHE_SIZE:
+        del _csr_cache[next(iter(_csr_cache))]
+    _csr_cache[key] = (edges, graph)
+    return graph, edges
+
+
+def _dense_distances(dist: Dict[int, float], n: int) -> 'np.ndarray':
+    """float64[n] copy of a {vertex: distance} dict, inf where absent."""
+    arr = np.full(n, np.inf)
+    if dist:
+        count = len(dist)
+        arr[np.fromiter(dist.keys(), dtype=np.int64, count=count)] = \
+            np.fromiter(dist.values(), dtype=np.float64, count=count)
+    return arr
+
+
+def _count_mismatches_dense(test: 'np.ndarray', ref: 'np.ndarray') -> Tuple[int, float]:
+    """
+    (mismatch count, mean |error| over mismatches where both are finite) for
+    dense distance vectors; same rule as compare_algorithms' dict version.
+    """
+    with np.errstate(invalid='ignore'):
+        diff = np.abs(ref - test)  # inf - inf -> nan, which compares False below
+    mismatched = diff > 1e-9
+    mismatches = int(np.count_nonzero(mismatched))
+    if mismatches == 0:
+        return 0, 0.0
+    finite = mismatched & np.isfinite(ref) & np.isfinite(test)
+    # Sum in vertex order with Python floats, matching the dict version bit for bit
+    return mismatches, sum(diff[finite].tolist()) / mismatches
+
+
+class _SSSPTimeout(BaseException):
+    """Raised from the SIGALRM handler; a BaseException so the solver's `except Exception` can't swallow it."""
+
+
+def _sssp_stats() -> Dict[str, Any]:
+    """Summarize the sssp_concept globals left by the last solve."""
+    d_hat = sssp_concept.d_hat
+    N_vertices = sssp_concept.N_vertices
+    
+    # d_hat holds one distance per vertex, so counting its finite values is
+    # the reachable count
+    if HAS_NUMPY:
+        reachable = int(np.count_nonzero(np.isfinite(np.fromiter(d_hat, np.float64, len(d_hat)))))
+    else:
+        inf = float('inf')
+        reachable = sum(1 for d in d_hat if d != inf)
+    
+    return {
+        'n': N_vertices,
+        'k_param': sssp_concept.k_param,
+        't_param': sssp_concept.t_param,
+        'reachable_count': reachable,
+        'unreachable_count': N_vertices - reachable,
+        'reachable_pct': 100.0 * reachable / N_vertices if N_vertices > 0 else 0.0,
+    }
+
+
+def _sssp_worker(n: int, edges: List[Tuple[int, int, float]], source: int, q: mp.Queue, dist_out):
+    """
+    Worker function to run SSSP in a subprocess.
+
+    Distances go into the shared `dist_out` array (float64[n], inf for
+    unreachable); only the small status/stats dict goes through the queue.
+    """
     try:
-        import sssp_concept
-        t0 = time.time()
-        dist = solve_sssp_directed_real_weights(n, len(edges), edges, source)
-        elapsed = time.time() - t0
-        
-        # Compute stats inline from subprocess globals
-        d_hat = sssp_concept.d_hat
-        N_vertices = sssp_concept.N_vertices
-        k_param = sssp_concept.k_param
-        t_param = sssp_concept.t_param
-        
-        reachable = [v for v in range(N_vertices) if d_hat.get(v, float('inf')) != float('inf')]
-        
-        stats = {
-            'n': N_vertices,
-            'k_param': k_param,
-            't_param': t_param,
-            'reachable_count': len(reachable),
-            'unreachable_count': N_vertices - len(reachable),
-            'reachable_pct': 100.0 * len(reachable) / N_vertices if N_vertices > 0 else 0.0,
-        }
+        t0 = time.perf_counter_ns()
+        dense = solve_sssp_directed_real_weights(n, len(edges), edges, source, dense=True)
+        elapsed_ns = time.perf_counter_ns() - t0
+        dist_out[:] = dense
         
         q.put({
             'ok': True,
-            'distances': dist,
-            'time': elapsed,
-            'stats': stats,
+            'time': elapsed_ns / 1e9,
+            'time_ns': elapsed_ns,
+            'stats': _sssp_stats(),
         })
     except Exception as e:
         q.put({'ok': False, 'error': str(e)})
 
 
+def _alarm_available() -> bool:
+    # setitimer is POSIX-only, and signal handlers only run in the main thread
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def _run_sssp_inline(n: int, edges: List[Tuple[int, int, float]], source: int, timeout: float) -> Dict[str, Any]:
+    """
+    Run SSSP in this process under a SIGALRM timer.
+    
+    Same result dict as `_sssp_worker`, or {'ok': False, 'timed_out': True}
+    if the timer fires. Avoids the process start-up and edge-list pickling
+    of the subprocess path.
+    """
+    def on_alarm(signum, frame):
+        raise _SSSPTimeout()
+    
+    old_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        t0 = time.perf_counter_ns()
+        dist = solve_sssp_directed_real_weights(n, len(edges), edges, source)
+        elapsed_ns = time.perf_counter_ns() - t0
+    except _SSSPTimeout:
+        return {'ok': False, 'timed_out': True}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old_handler)
+    return {'ok': True, 'distances': dist, 'time': elapsed_ns / 1e9, 'time_ns': elapsed_ns,
+            'stats': _sssp_stats()}
+
+
+def _run_sssp_subprocess(n: int, edges: List[Tuple[int, int, float]], source: int, timeout: float) -> Dict[str, Any]:
+    """Fallback for `_run_sssp_inline` where SIGALRM is unavailable: run `_sssp_worker` and kill it on timeout."""
+    q: mp.Queue = mp.Queue()
+    # Shared float64[n] for the distances, so they aren't pickled through the
+    # queue (a large put could also block the child from exiting before join)
+    dist_out = mp.RawArray('d', n)
+    p = mp.Process(target=_sssp_worker, args=(n, edges, source, q, dist_out))
+    p.start()
+    p.join(timeout)
+
+    if p.is_alive():
+        p.terminate()
+        p.join()
+        return {'ok': False, 'timed_out': True}
+    try:
+        res = q.get_nowait()
+    except Exception:
+        return {'ok': False, 'error': 'no-result'}
+    if res.get('ok'):
+        inf = float('inf')
+        res['distances'] = {v: d for v, d in enumerate(dist_out[:]) if d != inf}
+    return res
+
+
 def compare_algorithms(
     n: int,
-    edges: List[Tuple[int, int, float]],
+    edges: Union[List[Tuple[int, int, float]], 'np.ndarray'],
     source: int = 0,
-    sssp_timeout_sec: float = 30.0  # Increased from 5s now that infinite loops are fixed
+    sssp_timeout_sec: float = 30.0,  # Increased from 5s now that infinite loops are fixed
+    graph: CSRGraph = None
 ) -> Dict[str, Any]:
-    """Compare pure Dijkstra, pure SSSP (with timeout), and hybrid."""
-    # Build graph
-    graph_dict: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}
-    for u, v, w in edges:
-        graph_dict[u][v] = w
+    """
+    Compare pure Dijkstra, pure SSSP (with timeout), and hybrid.
+
+    The CSR built from `edges` is cached per edges object (see
+    `_prepare_graph`), so don't modify `edges` in place between calls. Pass
+    the CSRGraph a graph_generator function returned alongside `edges` as
+    `graph` to skip building it again.
+    """
+    # Build graph (cached across calls with the same edges object)
+    graph, edges = _prepare_graph(edges, n, graph)
+    # Keep the kernel load out of the Dijkstra timing below
+    _warm_dijkstra()
     
     results = {}
     
-    # Run pure Dijkstra (reference/correct)
-    start = time.time()
-    dijkstra_dist = dijkstra_single_source(graph_dict, n, source)
+    # Run pure Dijkstra (reference/correct). Timings use perf_counter_ns;
+    # each 'time' (seconds) has an integer 'time_ns' next to it.
+    start = time.perf_counter_ns()
+    dijkstra_dist = dijkstra_single_source(graph, n, source)
+    dijkstra_ns = time.perf_counter_ns() - start
     results['dijkstra'] = {
         'distances': dijkstra_dist,
-        'time': time.time() - start,
+        'time': dijkstra_ns / 1e9,
+        'time_ns': dijkstra_ns,
         'reachable': len(dijkstra_dist),
+        'unreachable': n - len(dijkstra_dist),
     }
     
-    # Run pure SSSP with timeout safeguard (30s instead of 5s now that infinite loops are fixed)
-    q: mp.Queue = mp.Queue()
-    p = mp.Process(target=_sssp_worker, args=(n, edges, source, q))
-    p.start()
-    p.join(30)  # 30 second timeout
+    # Run pure SSSP with timeout safeguard: in-process under SIGALRM where
+    # available, otherwise in a subprocess that is killed on timeout
+    if _alarm_available():
+        res = _run_sssp_inline(n, edges, source, sssp_timeout_sec)
+    else:
+        res = _run_sssp_subprocess(n, edges, source, sssp_timeout_sec)
 
     sssp_timed_out = False
     sssp_dist: Dict[int, float] = {}
     sssp_stats = {}
 
-    if p.is_alive():
-        # Timeout
-        p.terminate()
-        p.join()
+    if res.get('ok'):
+        sssp_dist = res['distances']
+        sssp_stats = res.get('stats', {})
+        results['sssp'] = {
+            'distances': sssp_dist,
+            'time': res['time'],
+            'time_ns': res['time_ns'],
+            'reachable': len(sssp_dist),
+            'unreachable': n - len(sssp_dist),
+            'stats': sssp_stats,
+        }
+    else:
         sssp_timed_out = True
         results['sssp'] = {
             'distances': {},
-            'time': 30,
+            'time': sssp_timeout_sec,
+            'time_ns': int(sssp_timeout_sec * 1e9),
             'reachable': 0,
+            'unreachable': n,
             'stats': {},
             'timed_out': True,
         }
-    else:
-        # Retrieve result
-        try:
-            res = q.get_nowait()
-        except Exception:
-            res = {'ok': False, 'error': 'no-result'}
-        if res.get('ok'):
-            sssp_dist = res['distances']
-            sssp_stats = res.get('stats', {})
-            results['sssp'] = {
-                'distances': sssp_dist,
-                'time': res['time'],
-                'reachable': len(sssp_dist),
-                'stats': sssp_stats,
-            }
-        else:
-            sssp_timed_out = True
-            results['sssp'] = {
-                'distances': {},
-                'time': sssp_timeout_sec,
-                'reachable': 0,
-                'stats': {},
-                'timed_out': True,
-                'error': res.get('error'),
-            }
+        if not res.get('timed_out'):
+            results['sssp']['error'] = res.get('error')
     
     # Hybrid: if SSSP timed out, degrade to pure Dijkstra
     if sssp_timed_out:
@@ -159,6 +402,7 @@ def compare_algorithms(
             'sssp_reachable': 0,
             'dijkstra_filled': results['dijkstra']['reachable'],
             'total_reachable': results['dijkstra']['reachable'],
+            'total_unreachable': results['dijkstra']['unreachable'],
             'sssp_stats': {},
             'n': n,
             'm': len(edges),
@@ -166,15 +410,15 @@ def compare_algorithms(
         }
     else:
         # Normal hybrid: SSSP + Dijkstra fill
-        missing = set(range(n)) - set(sssp_dist.keys())
+        # Vertices SSSP missed are exactly the Dijkstra-reachable ones absent
+        # from sssp_dist; walking dijkstra_dist avoids building two n-sized sets
         final_dist = dict(sssp_dist)
         dijkstra_filled = 0
         
-        if missing:
-            for v in missing:
-                if v in dijkstra_dist:
-                    final_dist[v] = dijkstra_dist[v]
-                    dijkstra_filled += 1
+        for v, d in dijkstra_dist.items():
+            if v not in sssp_dist:
+                final_dist[v] = d
+                dijkstra_filled += 1
         
         results['hybrid'] = {
             'distances': final_dist,
@@ -184,6 +428,7 @@ def compare_algorithms(
             'sssp_reachable': len(sssp_dist),
             'dijkstra_filled': dijkstra_filled,
             'total_reachable': len(final_dist),
+            'total_unreachable': n - len(final_dist),
             'sssp_stats': sssp_stats,
             'n': n,
             'm': len(edges),
@@ -191,24 +436,39 @@ def compare_algorithms(
     
     # Compare correctness
     def count_mismatches(test_dist, ref_dist):
+        inf = float('inf')
         mismatches = 0
         total_error = 0.0
-        all_verts = set(ref_dist.keys()) | set(test_dist.keys())
-        for v in all_verts:
-            ref_d = ref_dist.get(v, float('inf'))
-            test_d = test_dist.get(v, float('inf'))
+        # Every vertex in ref_dist, then the ones only test_dist has (their
+        # reference distance is inf), without materializing the key union
+        for v, ref_d in ref_dist.items():
+            test_d = test_dist.get(v, inf)
             if abs(ref_d - test_d) > 1e-9:
                 mismatches += 1
-                if ref_d != float('inf') and test_d != float('inf'):
+                if ref_d != inf and test_d != inf:
                     total_error += abs(ref_d - test_d)
+        for v, test_d in test_dist.items():
+            if v not in ref_dist and abs(inf - test_d) > 1e-9:
+                mismatches += 1
         avg_error = total_error / mismatches if mismatches > 0 else 0.0
         return mismatches, avg_error
     
-    sssp_mis, sssp_err = count_mismatches(sssp_dist, dijkstra_dist)
+    if HAS_NUMPY:
+        # Densify the single Dijkstra result once and diff both SSSP and
+        # hybrid against it with array ops. The hybrid vector is SSSP's with
+        # the inf gaps filled from the reference, i.e. exactly final_dist.
+        ref = _dense_distances(dijkstra_dist, n)
+        sssp_arr = _dense_distances(sssp_dist, n)
+        sssp_mis, sssp_err = _count_mismatches_dense(sssp_arr, ref)
+        hybrid_arr = ref if sssp_timed_out else np.where(np.isinf(sssp_arr), ref, sssp_arr)
+        hybrid_mis, hybrid_err = _count_mismatches_dense(hybrid_arr, ref)
+    else:
+        sssp_mis, sssp_err = count_mismatches(sssp_dist, dijkstra_dist)
+        hybrid_mis, hybrid_err = count_mismatches(results['hybrid']['distances'], dijkstra_dist)
+
     results['sssp']['mismatches_vs_dijkstra'] = sssp_mis
     results['sssp']['avg_error_vs_dijkstra'] = sssp_err
     
-    hybrid_mis, hybrid_err = count_mismatches(results['hybrid']['distances'], dijkstra_dist)
     results['hybrid']['mismatches_vs_dijkstra'] = hybrid_mis
     results['hybrid']['avg_error_vs_dijkstra'] = hybrid_err
     
@@ -9,19 +9,32 @@ Reads experiment_results.csv and generates plots for presentation:
 
 Usage:
     python plot_results.py [input_csv]
+
+The CSV is parsed with pandas when it is installed (optional), else streamed
+through the csv module.
     
 Output:
     - PNG files saved to plots/ directory
 """
 
 import csv
+import hashlib
+import multiprocessing
+import os
+import pickle
 import sys
-from collections import defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
 
 try:
     import matplotlib.pyplot as plt
     import matplotlib
+    import numpy as np  # hard dependency of matplotlib
     matplotlib.use('Agg')  # Non-interactive backend
     HAS_MATPLOTLIB = True
 except ImportError:
@@ -30,29 +43,37 @@ except ImportError:
     print("Plots will not be generated, but you can still view the CSV data.")
 
 
-def load_results(filename: str) -> List[Dict[str, Any]]:
-    """Load experiment results from CSV."""
-    results = []
+# Numeric CSV columns; INT_COLUMNS are parsed with int(float(x)), the rest with float(x)
+NUMERIC_COLUMNS = ['trial', 'graph_size', 'num_edges', 'runtime_ms', 'reachable', 
+                   'num_inf', 'num_diff_vs_dijkstra', 'avg_error_vs_dijkstra',
+                   'k_param', 't_param', 'sssp_time_ms', 'dijkstra_fill_time_ms',
+                   'sssp_reachable', 'dijkstra_filled']
+INT_COLUMNS = frozenset(['k_param', 't_param', 'trial', 'graph_size', 'num_edges', 
+                         'reachable', 'num_inf', 'num_diff_vs_dijkstra', 
+                         'sssp_reachable', 'dijkstra_filled'])
+
+
+def _iter_results(filename: str):
+    """Yield experiment result rows from CSV with numeric fields converted, one at a time."""
     with open(filename, 'r') as f:
         reader = csv.DictReader(f)
         for row in reader:
             # Convert numeric fields
-            for key in ['trial', 'graph_size', 'num_edges', 'runtime_ms', 'reachable', 
-                        'num_inf', 'num_diff_vs_dijkstra', 'avg_error_vs_dijkstra',
-                        'k_param', 't_param', 'sssp_time_ms', 'dijkstra_fill_time_ms',
-                        'sssp_reachable', 'dijkstra_filled']:
+            for key in NUMERIC_COLUMNS:
                 if key in row and row[key] and row[key] != '':
                     try:
-                        if key in ['k_param', 't_param', 'trial', 'graph_size', 'num_edges', 
-                                   'reachable', 'num_inf', 'num_diff_vs_dijkstra', 
-                                   'sssp_reachable', 'dijkstra_filled']:
+                        if key in INT_COLUMNS:
                             row[key] = int(float(row[key]))
                         else:
                             row[key] = float(row[key])
                     except ValueError:
                         row[key] = None
-            results.append(row)
-    return results
+            yield row
+
+
+def load_results(filename: str) -> List[Dict[str, Any]]:
+    """Load experiment results from CSV."""
+    return list(_iter_results(filename))
 
 
 def aggregate_by_size_and_algo(results: List[Dict[str, Any]]) -> Dict[int, Dict[str, Dict[str, float]]]:
@@ -62,257 +83,488 @@ def aggregate_by_size_and_algo(results: List[Dict[str, Any]]) -> Dict[int, Dict[
     Returns:
         {size: {algorithm: {metric: value}}}
     """
-    by_size_algo = defaultdict(lambda: defaultdict(list))
+    # Flat (size, algo) -> rows grouping: one hash lookup per row, no default factory
+    by_size_algo: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
     
     for row in results:
-        size = row['graph_size']
-        algo = row['algorithm']
-        by_size_algo[(size, algo)].append(row)
+        key = (row['graph_size'], row['algorithm'])
+        group = by_size_algo.get(key)
+        if group is None:
+            group = by_size_algo[key] = []
+        group.append(row)
+    
+    aggregated: Dict[int, Dict[str, Dict[str, float]]] = {}
     
-    aggregated = defaultdict(lambda: defaultdict(dict))
+    def mean(rows, col):
+        # Average over the trials that have a value (empty cells stay '',
+        # unparseable ones None); NaN when none do
+        values = [r[col] for r in rows if isinstance(r.get(col), (int, float))]
+        return sum(values) / len(values) if values else float('nan')
     
     for (size, algo), rows in by_size_algo.items():
         # Average over trials
-        aggregated[size][algo] = {
-            'runtime_ms': sum(r['runtime_ms'] for r in rows) / len(rows),
-            'reachable': sum(r['reachable'] for r in rows) / len(rows),
-            'num_inf': sum(r['num_inf'] for r in rows) / len(rows),
-            'num_diff': sum(r['num_diff_vs_dijkstra'] for r in rows) / len(rows),
-            'avg_error': sum(r['avg_error_vs_dijkstra'] for r in rows) / len(rows),
-            'graph_size': size,
-        }
+        entry = {name: mean(rows, col) for name, col in METRIC_COLUMNS.items()}
+        entry['graph_size'] = size
         
-        # Hybrid-specific
-        if algo == 'hybrid' and 'sssp_time_ms' in rows[0] and rows[0]['sssp_time_ms'] is not None:
-            aggregated[size][algo]['sssp_time_ms'] = sum(r['sssp_time_ms'] for r in rows) / len(rows)
-            aggregated[size][algo]['dijkstra_fill_time_ms'] = sum(r['dijkstra_fill_time_ms'] for r in rows) / len(rows)
-            aggregated[size][algo]['sssp_reachable'] = sum(r['sssp_reachable'] for r in rows) / len(rows)
-            aggregated[size][algo]['dijkstra_filled'] = sum(r['dijkstra_filled'] for r in rows) / len(rows)
+        # Hybrid-specific, if any of the group's rows has them
+        if algo == 'hybrid' and any(isinstance(r.get('sssp_time_ms'), (int, float)) for r in rows):
+            for col in HYBRID_COLUMNS:
+                entry[col] = mean(rows, col)
+        
+        aggregated.setdefault(size, {})[algo] = entry
     
     return aggregated
 
 
-def plot_runtime_comparison(data: Dict, output_file: str = "plots/runtime_comparison.png"):
+# Aggregated metric name -> CSV column it averages
+METRIC_COLUMNS = {
+    'runtime_ms': 'runtime_ms',
+    'reachable': 'reachable',
+    'num_inf': 'num_inf',
+    'num_diff': 'num_diff_vs_dijkstra',
+    'avg_error': 'avg_error_vs_dijkstra',
+}
+HYBRID_COLUMNS = ['sssp_time_ms', 'dijkstra_fill_time_ms', 'sssp_reachable', 'dijkstra_filled']
+
+
+# Rows per pandas chunk when streaming the CSV
+CSV_CHUNK_ROWS = 100_000
+
+
+def _aggregate_with_pandas(filename: str) -> Tuple[int, Dict[int, Dict[str, Dict[str, float]]]]:
+    """
+    `aggregate_by_size_and_algo(load_results(filename))` via pandas' C parser.
+
+    The CSV is read in chunks of CSV_CHUNK_ROWS; each chunk is reduced to
+    per-(size, algorithm) sums and counts, so memory is bounded by the number
+    of groups rather than the number of rows.
+    """
+    wanted = {'graph_size', 'algorithm', *METRIC_COLUMNS.values(), *HYBRID_COLUMNS}
+    num_rows = 0
+    partial_sums = []
+    partial_counts = []
+    for chunk in pd.read_csv(filename, usecols=lambda c: c in wanted, chunksize=CSV_CHUNK_ROWS):
+        value_cols = [c for c in [*METRIC_COLUMNS.values(), *HYBRID_COLUMNS] if c in chunk.columns]
+        # Unparseable cells become NaN (load_results maps them to None)
+        chunk[value_cols] = chunk[value_cols].apply(pd.to_numeric, errors='coerce')
+        chunk['graph_size'] = pd.to_numeric(chunk['graph_size']).astype('int64')
+        grouped = chunk.groupby(['graph_size', 'algorithm'], sort=False)[value_cols]
+        partial_sums.append(grouped.sum())
+        partial_counts.append(grouped.count())
+        num_rows += len(chunk)
+
+    aggregated: Dict[int, Dict[str, Dict[str, float]]] = {}
+    if not partial_sums:
+        return 0, aggregated
+    sums = pd.concat(partial_sums).groupby(level=[0, 1], sort=False).sum()
+    counts = pd.concat(partial_counts).groupby(level=[0, 1], sort=False).sum()
+    means = sums / counts  # NaN where a column had no values in a group
+
+    for (size, algo), row in means.iterrows():
+        size = int(size)
+        entry = {name: float(row[col]) for name, col in METRIC_COLUMNS.items()}
+        entry['graph_size'] = size
+        # Hybrid-specific
+        if algo == 'hybrid' and 'sssp_time_ms' in row and pd.notna(row['sssp_time_ms']):
+            for col in HYBRID_COLUMNS:
+                entry[col] = float(row[col])
+        aggregated.setdefault(size, {})[algo] = entry
+    return num_rows, aggregated
+
+
+def _aggregate_streaming(filename: str) -> Tuple[int, Dict[int, Dict[str, Dict[str, float]]]]:
+    """
+    Stdlib `aggregate_by_size_and_algo(load_results(filename))` that folds rows
+    into running per-group sums as they are read instead of keeping them all.
+    
+    Rows are read with csv.reader and columns picked by position, so no dict
+    is built per row. Each column keeps its own count, so empty or unparseable
+    cells are skipped as in the pandas path.
+    """
+    # (size, algo) -> [running sums, value counts], one slot per column
+    groups: Dict[Tuple[int, str], list] = {}
+    num_rows = 0
+    with open(filename, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {name: i for i, name in enumerate(header)}
+        size_i = idx['graph_size']
+        algo_i = idx['algorithm']
+        columns = list(METRIC_COLUMNS.values())
+        if all(col in idx for col in HYBRID_COLUMNS):
+            columns += HYBRID_COLUMNS
+        col_idx = [(j, idx[col], col in INT_COLUMNS) for j, col in enumerate(columns)]
+
+        for row in reader:
+            if not row:
+                continue
+            num_rows += 1
+            key = (int(float(row[size_i])), row[algo_i])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [[0] * len(columns), [0] * len(columns)]
+            sums, counts = group
+            for j, i, is_int in col_idx:
+                v = row[i]
+                if not v:
+                    continue
+                try:
+                    sums[j] += int(float(v)) if is_int else float(v)
+                except ValueError:
+                    continue
+                counts[j] += 1
+
+    aggregated: Dict[int, Dict[str, Dict[str, float]]] = {}
+    for (size, algo), (sums, counts) in groups.items():
+        means = {col: total / count if count else float('nan')
+                 for col, total, count in zip(columns, sums, counts)}
+        entry = {name: means[col] for name, col in METRIC_COLUMNS.items()}
+        entry['graph_size'] = size
+        # Hybrid-specific, if any of the group's rows has them
+        if algo == 'hybrid' and 'sssp_time_ms' in means and counts[columns.index('sssp_time_ms')]:
+            for col in HYBRID_COLUMNS:
+                entry[col] = means[col]
+        aggregated.setdefault(size, {})[algo] = entry
+    return num_rows, aggregated
+
+
+def load_aggregated(filename: str) -> Tuple[int, Dict[int, Dict[str, Dict[str, float]]]]:
+    """
+    Load and aggregate a results CSV in one step.
+    
+    Uses pandas chunks when installed, else streaming csv rows; both give the
+    same result as aggregate_by_size_and_algo(load_results(...)). Empty or
+    unparseable cells are skipped: a mean is over the cells that have a value,
+    and NaN when none do.
+    
+    Returns:
+        (number of result rows, {size: {algorithm: {metric: value}}})
+    """
+    if HAS_PANDAS:
+        return _aggregate_with_pandas(filename)
+    return _aggregate_streaming(filename)
+
+
+# Bump when the aggregated layout changes so stale caches are ignored
+AGG_CACHE_VERSION = 2
+
+
+def load_aggregated_cached(filename: str, cache_file: str) -> Tuple[int, Dict[int, Dict[str, Dict[str, float]]]]:
+    """
+    `load_aggregated`, memoized in a pickle keyed by the CSV's path, size and
+    mtime, so re-running the plots on an unchanged CSV skips the parse.
+    """
+    st = os.stat(filename)
+    key = (AGG_CACHE_VERSION, os.path.abspath(filename), st.st_size, st.st_mtime_ns)
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['key'] == key:
+            return cached['num_rows'], cached['data']
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+        pass
+
+    num_rows, data = load_aggregated(filename)
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump({'key': key, 'num_rows': num_rows, 'data': data}, f)
+    except OSError:
+        pass  # caching is best-effort
+    return num_rows, data
+
+
+# savefig options for every plot. 150 dpi is plenty for <=20-point line plots,
+# and the figures are laid out with tight_layout(), so bbox_inches='tight'
+# (which renders twice to measure the bounding box) is not needed.
+SAVE_KW = {'dpi': 150}
+
+# One Figure per process, cleared and reused by every plot_* call instead of
+# building and tearing down a Figure/canvas per plot
+_FIG = None
+
+
+def _get_figure():
+    """Return the shared 10x6 Figure, cleared for the next plot."""
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure(figsize=(10, 6))
+    else:
+        _FIG.clear()
+    return _FIG
+
+
+ALGORITHMS = ['dijkstra', 'sssp', 'hybrid']
+
+# Line style per algorithm, shared by every plot (labels vary per plot)
+STYLE = {
+    'dijkstra': dict(marker='o', color='#2E86AB', linewidth=2, markersize=8),
+    'sssp': dict(marker='s', color='#A23B72', linewidth=2, markersize=8),
+    'hybrid': dict(marker='^', color='#F18F01', linewidth=2, markersize=8),
+}
+SOA_METRICS = ['runtime_ms', 'reachable', 'num_inf', 'sssp_time_ms', 'dijkstra_fill_time_ms']
+
+
+def _speedup(baseline, times):
+    """baseline / times elementwise; 1.0 where times <= 0, NaN where times is missing."""
+    speedup = np.divide(baseline, times, out=np.ones_like(times), where=times > 0)
+    speedup[np.isnan(times)] = np.nan
+    return speedup
+
+
+def _to_soa(data: Dict) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """
+    Flatten the aggregated {size: {algo: {metric: value}}} dict into column arrays
+    in one pass: sorted `sizes`, plus soa[metric][algo] aligned with `sizes`.
+    Missing algorithms/metrics become NaN, which matplotlib draws as gaps.
+    soa['speedup'][algo] holds each of SSSP/Hybrid's speedup over Dijkstra and
+    soa['coverage'][algo] each algorithm's % of vertices reached.
+    """
+    order = sorted(data)
+    sizes = np.array(order)
+    soa = {m: {a: np.full(len(order), np.nan) for a in ALGORITHMS} for m in SOA_METRICS}
+    for i, size in enumerate(order):
+        for algo, metrics in data[size].items():
+            if algo not in ALGORITHMS:
+                continue
+            for m in SOA_METRICS:
+                value = metrics.get(m)
+                if value is not None:
+                    soa[m][algo][i] = value
+
+    # Derived series, computed once here rather than inside the plotters
+    runtime = soa['runtime_ms']
+    soa['speedup'] = {algo: _speedup(runtime['dijkstra'], runtime[algo]) for algo in ('sssp', 'hybrid')}
+    # Coverage for every algorithm in one broadcast divide of the stacked
+    # (algorithms x sizes) reachable counts by sizes; NaN stays NaN
+    reachable = np.vstack([soa['reachable'][algo] for algo in ALGORITHMS])
+    soa['coverage'] = dict(zip(ALGORITHMS, 100.0 * reachable / sizes))
+    return sizes, soa
+
+
+def _has_data(*columns) -> bool:
+    """True if any of the SoA columns has a non-NaN value (else the plot would be empty)."""
+    return any(not np.isnan(col).all() for col in columns)
+
+
+def plot_runtime_comparison(sizes, soa: Dict, output_file: str = "plots/runtime_comparison.png"):
     """Plot runtime vs graph size for all algorithms."""
     if not HAS_MATPLOTLIB:
-        return
+        return False
     
-    sizes = sorted(data.keys())
+    if not _has_data(*soa['runtime_ms'].values()):
+        print(f"  Skipped: {output_file} (no data)")
+        return False
     
-    # Extract data for each algorithm
-    algorithms = ['dijkstra', 'sssp', 'hybrid']
-    algo_data = {algo: [] for algo in algorithms}
-    
-    for size in sizes:
-        for algo in algorithms:
-            if algo in data[size]:
-                algo_data[algo].append(data[size][algo]['runtime_ms'])
-            else:
-                algo_data[algo].append(None)
+    runtime = soa['runtime_ms']
     
     # Create plot
-    plt.figure(figsize=(10, 6))
+    fig = _get_figure()
+    ax = fig.add_subplot(111)
     
-    colors = {'dijkstra': '#2E86AB', 'sssp': '#A23B72', 'hybrid': '#F18F01'}
-    markers = {'dijkstra': 'o', 'sssp': 's', 'hybrid': '^'}
     labels = {'dijkstra': 'Dijkstra', 'sssp': 'New SSSP', 'hybrid': 'Hybrid (SSSP+Dijkstra)'}
     
-    for algo in algorithms:
-        if any(v is not None for v in algo_data[algo]):
-            plt.plot(sizes, algo_data[algo], marker=markers[algo], 
-                     label=labels[algo], color=colors[algo], linewidth=2, markersize=8)
+    for algo in ALGORITHMS:
+        if not np.isnan(runtime[algo]).all():
+            ax.plot(sizes, runtime[algo], label=labels[algo], **STYLE[algo])
     
-    plt.xlabel('Graph Size (n vertices)', fontsize=12)
-    plt.ylabel('Runtime (milliseconds)', fontsize=12)
-    plt.title('Algorithm Runtime Comparison', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel('Graph Size (n vertices)', fontsize=12)
+    ax.set_ylabel('Runtime (milliseconds)', fontsize=12)
+    ax.set_title('Algorithm Runtime Comparison', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
     
     # Save
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, **SAVE_KW)
     print(f"  Saved: {output_file}")
-    plt.close()
+    return True
 
 
-def plot_inf_vertices(data: Dict, output_file: str = "plots/inf_vertices.png"):
+def plot_inf_vertices(sizes, soa: Dict, output_file: str = "plots/inf_vertices.png"):
     """Plot number of INF vertices vs graph size."""
     if not HAS_MATPLOTLIB:
-        return
+        return False
     
-    sizes = sorted(data.keys())
+    if not _has_data(soa['num_inf']['sssp'], soa['num_inf']['hybrid']):
+        print(f"  Skipped: {output_file} (no data)")
+        return False
     
-    # Extract data for SSSP and Hybrid
-    sssp_inf = [data[size]['sssp']['num_inf'] if 'sssp' in data[size] else 0 for size in sizes]
-    hybrid_inf = [data[size]['hybrid']['num_inf'] if 'hybrid' in data[size] else 0 for size in sizes]
+    # SSSP and Hybrid; a missing algorithm counts as 0 INF vertices
+    sssp_inf = np.nan_to_num(soa['num_inf']['sssp'])
+    hybrid_inf = np.nan_to_num(soa['num_inf']['hybrid'])
     
-    plt.figure(figsize=(10, 6))
+    fig = _get_figure()
+    ax = fig.add_subplot(111)
     
-    plt.plot(sizes, sssp_inf, marker='s', label='SSSP (before fill)', 
-             color='#A23B72', linewidth=2, markersize=8)
-    plt.plot(sizes, hybrid_inf, marker='^', label='Hybrid (after Dijkstra fill)', 
-             color='#F18F01', linewidth=2, markersize=8)
+    ax.plot(sizes, sssp_inf, label='SSSP (before fill)', **STYLE['sssp'])
+    ax.plot(sizes, hybrid_inf, label='Hybrid (after Dijkstra fill)', **STYLE['hybrid'])
     
-    plt.xlabel('Graph Size (n vertices)', fontsize=12)
-    plt.ylabel('Number of INF Vertices', fontsize=12)
-    plt.title('Unreachable Vertices (INF) by Algorithm', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel('Graph Size (n vertices)', fontsize=12)
+    ax.set_ylabel('Number of INF Vertices', fontsize=12)
+    ax.set_title('Unreachable Vertices (INF) by Algorithm', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
     
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, **SAVE_KW)
     print(f"  Saved: {output_file}")
-    plt.close()
+    return True
 
 
-def plot_coverage(data: Dict, output_file: str = "plots/coverage.png"):
+def plot_coverage(sizes, soa: Dict, output_file: str = "plots/coverage.png"):
     """Plot coverage (% reachable) vs graph size."""
     if not HAS_MATPLOTLIB:
-        return
+        return False
     
-    sizes = sorted(data.keys())
+    if not _has_data(*soa['coverage'].values()):
+        print(f"  Skipped: {output_file} (no data)")
+        return False
     
-    # Calculate coverage percentage
-    dijkstra_coverage = []
-    sssp_coverage = []
-    hybrid_coverage = []
+    # Coverage percentage (NaN where the algorithm is missing)
+    dijkstra_coverage = soa['coverage']['dijkstra']
+    sssp_coverage = soa['coverage']['sssp']
+    hybrid_coverage = soa['coverage']['hybrid']
     
-    for size in sizes:
-        total = size
-        
-        if 'dijkstra' in data[size]:
-            dijkstra_coverage.append(100.0 * data[size]['dijkstra']['reachable'] / total)
-        else:
-            dijkstra_coverage.append(None)
-        
-        if 'sssp' in data[size]:
-            sssp_coverage.append(100.0 * data[size]['sssp']['reachable'] / total)
-        else:
-            sssp_coverage.append(None)
-        
-        if 'hybrid' in data[size]:
-            hybrid_coverage.append(100.0 * data[size]['hybrid']['reachable'] / total)
-        else:
-            hybrid_coverage.append(None)
-    
-    plt.figure(figsize=(10, 6))
-    
-    plt.plot(sizes, dijkstra_coverage, marker='o', label='Dijkstra', 
-             color='#2E86AB', linewidth=2, markersize=8)
-    plt.plot(sizes, sssp_coverage, marker='s', label='SSSP', 
-             color='#A23B72', linewidth=2, markersize=8)
-    plt.plot(sizes, hybrid_coverage, marker='^', label='Hybrid', 
-             color='#F18F01', linewidth=2, markersize=8)
-    
-    plt.xlabel('Graph Size (n vertices)', fontsize=12)
-    plt.ylabel('Coverage (% Reachable)', fontsize=12)
-    plt.title('Algorithm Coverage: Reachable Vertices', fontsize=14, fontweight='bold')
-    plt.ylim(0, 105)
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig = _get_figure()
+    ax = fig.add_subplot(111)
+    
+    ax.plot(sizes, dijkstra_coverage, label='Dijkstra', **STYLE['dijkstra'])
+    ax.plot(sizes, sssp_coverage, label='SSSP', **STYLE['sssp'])
+    ax.plot(sizes, hybrid_coverage, label='Hybrid', **STYLE['hybrid'])
+    
+    ax.set_xlabel('Graph Size (n vertices)', fontsize=12)
+    ax.set_ylabel('Coverage (% Reachable)', fontsize=12)
+    ax.set_title('Algorithm Coverage: Reachable Vertices', fontsize=14, fontweight='bold')
+    ax.set_ylim(0, 105)
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    
+    fig.savefig(output_file, **SAVE_KW)
     print(f"  Saved: {output_file}")
-    plt.close()
+    return True
 
 
-def plot_speedup(data: Dict, output_file: str = "plots/speedup_comparison.png"):
+def plot_speedup(sizes, soa: Dict, output_file: str = "plots/speedup_comparison.png"):
     """Plot speedup of SSSP and Hybrid vs Dijkstra baseline."""
     if not HAS_MATPLOTLIB:
-        return
+        return False
     
-    sizes = sorted(data.keys())
+    if not _has_data(*soa['speedup'].values()):
+        print(f"  Skipped: {output_file} (no data)")
+        return False
     
-    sssp_speedup = []
-    hybrid_speedup = []
+    sssp_speedup = soa['speedup']['sssp']
+    hybrid_speedup = soa['speedup']['hybrid']
     
-    for size in sizes:
-        dijk_time = data[size]['dijkstra']['runtime_ms']
-        
-        if 'sssp' in data[size]:
-            sssp_time = data[size]['sssp']['runtime_ms']
-            sssp_speedup.append(dijk_time / sssp_time if sssp_time > 0 else 1.0)
-        else:
-            sssp_speedup.append(None)
-        
-        if 'hybrid' in data[size]:
-            hybrid_time = data[size]['hybrid']['runtime_ms']
-            hybrid_speedup.append(dijk_time / hybrid_time if hybrid_time > 0 else 1.0)
-        else:
-            hybrid_speedup.append(None)
-    
-    plt.figure(figsize=(10, 6))
+    fig = _get_figure()
+    ax = fig.add_subplot(111)
     
     # Horizontal line at speedup=1 (baseline)
-    plt.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, label='Dijkstra baseline', alpha=0.5)
+    ax.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, label='Dijkstra baseline', alpha=0.5)
     
-    plt.plot(sizes, sssp_speedup, marker='s', label='SSSP speedup', 
-             color='#A23B72', linewidth=2, markersize=8)
-    plt.plot(sizes, hybrid_speedup, marker='^', label='Hybrid speedup', 
-             color='#F18F01', linewidth=2, markersize=8)
+    ax.plot(sizes, sssp_speedup, label='SSSP speedup', **STYLE['sssp'])
+    ax.plot(sizes, hybrid_speedup, label='Hybrid speedup', **STYLE['hybrid'])
     
-    plt.xlabel('Graph Size (n vertices)', fontsize=12)
-    plt.ylabel('Speedup vs Dijkstra (×)', fontsize=12)
-    plt.title('Runtime Speedup Comparison (Dijkstra = 1.0×)', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel('Graph Size (n vertices)', fontsize=12)
+    ax.set_ylabel('Speedup vs Dijkstra (×)', fontsize=12)
+    ax.set_title('Runtime Speedup Comparison (Dijkstra = 1.0×)', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
     
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, **SAVE_KW)
     print(f"  Saved: {output_file}")
-    plt.close()
+    return True
 
 
-def plot_hybrid_breakdown(data: Dict, output_file: str = "plots/hybrid_breakdown.png"):
+def plot_hybrid_breakdown(sizes, soa: Dict, output_file: str = "plots/hybrid_breakdown.png"):
     """Plot stacked bar chart showing SSSP vs Dijkstra fill time in hybrid approach."""
     if not HAS_MATPLOTLIB:
-        return
+        return False
     
-    sizes = sorted(data.keys())
+    if not _has_data(soa['sssp_time_ms']['hybrid']):
+        print(f"  Skipped: {output_file} (no data)")
+        return False
     
-    sssp_times = []
-    dijkstra_fill_times = []
+    # Sizes without hybrid timings get empty (0) bars
+    sssp_times = np.nan_to_num(soa['sssp_time_ms']['hybrid'])
+    dijkstra_fill_times = np.nan_to_num(soa['dijkstra_fill_time_ms']['hybrid'])
     
-    for size in sizes:
-        if 'hybrid' in data[size]:
-            hybrid_data = data[size]['hybrid']
-            if 'sssp_time_ms' in hybrid_data:
-                sssp_times.append(hybrid_data['sssp_time_ms'])
-                dijkstra_fill_times.append(hybrid_data['dijkstra_fill_time_ms'])
-            else:
-                sssp_times.append(0)
-                dijkstra_fill_times.append(0)
-        else:
-            sssp_times.append(0)
-            dijkstra_fill_times.append(0)
-    
-    plt.figure(figsize=(10, 6))
+    fig = _get_figure()
+    ax = fig.add_subplot(111)
     
     x = range(len(sizes))
     width = 0.6
     
-    plt.bar(x, sssp_times, width, label='SSSP Phase', color='#A23B72')
-    plt.bar(x, dijkstra_fill_times, width, bottom=sssp_times, 
-            label='Dijkstra Fill Phase', color='#F18F01')
+    ax.bar(x, sssp_times, width, label='SSSP Phase', color=STYLE['sssp']['color'])
+    ax.bar(x, dijkstra_fill_times, width, bottom=sssp_times, 
+           label='Dijkstra Fill Phase', color=STYLE['hybrid']['color'])
     
-    plt.xlabel('Graph Size (n vertices)', fontsize=12)
-    plt.ylabel('Runtime (milliseconds)', fontsize=12)
-    plt.title('Hybrid Algorithm Time Breakdown', fontsize=14, fontweight='bold')
-    plt.xticks(x, [str(s) for s in sizes])
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
+    ax.set_xlabel('Graph Size (n vertices)', fontsize=12)
+    ax.set_ylabel('Runtime (milliseconds)', fontsize=12)
+    ax.set_title('Hybrid Algorithm Time Breakdown', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels([str(s) for s in sizes])
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3, axis='y')
+    fig.tight_layout()
     
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, **SAVE_KW)
     print(f"  Saved: {output_file}")
-    plt.close()
+    return True
+
+
+# (plot function, output file name, (metric, algo) SoA columns it draws) for
+# every plot generate_all_plots renders
+PLOT_JOBS = [
+    (plot_runtime_comparison, "runtime_comparison.png", [('runtime_ms', a) for a in ALGORITHMS]),
+    (plot_inf_vertices, "inf_vertices.png", [('num_inf', 'sssp'), ('num_inf', 'hybrid')]),
+    (plot_coverage, "coverage.png", [('coverage', a) for a in ALGORITHMS]),
+    (plot_speedup, "speedup_comparison.png", [('speedup', 'sssp'), ('speedup', 'hybrid')]),
+    (plot_hybrid_breakdown, "hybrid_breakdown.png",
+     [('sssp_time_ms', 'hybrid'), ('dijkstra_fill_time_ms', 'hybrid')]),
+]
+
+# Bump when plot styling changes so existing PNGs are re-rendered
+PLOT_CACHE_VERSION = 1
+
+
+def _plot_hash(plot_fn, sizes, soa: Dict, columns) -> str:
+    """Content hash of exactly the data (and render settings) one plot depends on."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{PLOT_CACHE_VERSION}:{plot_fn.__name__}:{SAVE_KW}".encode())
+    h.update(np.ascontiguousarray(sizes, dtype=np.int64).tobytes())
+    for metric, algo in columns:
+        h.update(soa[metric][algo].tobytes())
+    return h.hexdigest()
+
+
+def _render_one(plot_fn, sizes, soa: Dict, output_file: str, digest: str):
+    """Pool worker: render a single plot (pyplot state is per-process) and record its hash."""
+    if plot_fn(sizes, soa, output_file):
+        with open(output_file + '.hash', 'w') as f:
+            f.write(digest)
+        return
+    # Skipped (no data): drop any PNG and hash left over from an earlier run
+    for path in (output_file, output_file + '.hash'):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_current(output_file: str, digest: str) -> bool:
+    """True if output_file exists and was rendered from data with this hash."""
+    try:
+        with open(output_file + '.hash') as f:
+            return f.read() == digest and os.path.exists(output_file)
+    except OSError:
+        return False
 
 
 def generate_all_plots(input_csv: str = "experiment_results.csv", output_dir: str = "plots"):
     """Generate all plots from experiment results."""
-    import os
-    
     # Create output directory
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -320,11 +572,10 @@ def generate_all_plots(input_csv: str = "experiment_results.csv", output_dir: st
     
     # Load and aggregate data
     print(f"\nLoading results from {input_csv}...")
-    results = load_results(input_csv)
-    print(f"  Loaded {len(results)} result rows")
+    num_rows, data = load_aggregated_cached(input_csv, os.path.join(output_dir, '.agg_cache.pkl'))
+    print(f"  Loaded {num_rows} result rows")
     
     print(f"\nAggregating data by size and algorithm...")
-    data = aggregate_by_size_and_algo(results)
     print(f"  Found {len(data)} unique graph sizes")
     
     if not HAS_MATPLOTLIB:
@@ -334,11 +585,26 @@ def generate_all_plots(input_csv: str = "experiment_results.csv", output_dir: st
     # Generate plots
     print(f"\nGenerating plots to {output_dir}/...")
     
-    plot_runtime_comparison(data, f"{output_dir}/runtime_comparison.png")
-    plot_inf_vertices(data, f"{output_dir}/inf_vertices.png")
-    plot_coverage(data, f"{output_dir}/coverage.png")
-    plot_speedup(data, f"{output_dir}/speedup_comparison.png")
-    plot_hybrid_breakdown(data, f"{output_dir}/hybrid_breakdown.png")
+    # Only re-render plots whose own input columns changed since the last run
+    sizes, soa = _to_soa(data)
+    jobs = []
+    for plot_fn, name, columns in PLOT_JOBS:
+        output_file = f"{output_dir}/{name}"
+        digest = _plot_hash(plot_fn, sizes, soa, columns)
+        if _is_current(output_file, digest):
+            print(f"  Unchanged: {output_file}")
+        else:
+            jobs.append((plot_fn, sizes, soa, output_file, digest))
+    
+    # The plots are independent and each spends most of its time rasterizing,
+    # so render them in parallel processes
+    processes = min(len(jobs), os.cpu_count() or 1)
+    if processes > 1:
+        with multiprocessing.Pool(processes=processes) as pool:
+            pool.starmap(_render_one, jobs)
+    else:
+        for job in jobs:
+            _render_one(*job)
     
     print(f"\n✓ All plots generated successfully!")
     print(f"  Location: {output_dir}/")
@@ -9,14 +9,15 @@ import os
 import csv
 import sys
 
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
 # Add parent directory to path if needed
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-print("=" * 80)
-print("SSSP ALGORITHM PERFORMANCE SUMMARY")
-print("=" * 80)
-print()
-
 default_paths = [
     os.path.join("results", "experiment_results.csv"),
     "experiment_results.csv",
@@ -26,72 +27,107 @@ input_file = next((p for p in default_paths if os.path.exists(p)), None)
 if not input_file:
     raise FileNotFoundError("experiment_results.csv not found in results/ or root")
 
-with open(input_file, 'r') as f:
-    reader = csv.DictReader(f)
-    results = list(reader)
-
+# Bucket the last sssp/dijkstra row per size as (runtime_ms, reachable) and
+# collect the SSSP timeout stats alongside.
+SSSP, DIJK = 0, 1
 by_size = {}
-for row in results:
-    n = int(row['graph_size'])
-    if n not in by_size:
-        by_size[n] = {}
-    algo = row['algorithm']
-    by_size[n][algo] = row
-
-print("Performance Comparison:")
-print("-" * 80)
-print(f"{'Size':<10} {'SSSP Time':<15} {'Dijk Time':<15} {'Coverage':<15} {'Status'}")
-print("-" * 80)
+successful = []
+timed_out = 0
+
+if HAS_PANDAS:
+    # Parse in C, then pick the last row per (size, algorithm) and split the
+    # SSSP runs by the timeout threshold with boolean masks
+    df = pd.read_csv(input_file, usecols=['graph_size', 'algorithm', 'runtime_ms', 'reachable'])
+    df = df[df['algorithm'].isin(['sssp', 'dijkstra'])]
+    last = df.drop_duplicates(['graph_size', 'algorithm'], keep='last')
+    for n, algo, rt, reach in zip(last['graph_size'].tolist(), last['algorithm'].tolist(),
+                                  last['runtime_ms'].tolist(), last['reachable'].tolist()):
+        by_size.setdefault(n, [None, None])[SSSP if algo == 'sssp' else DIJK] = (rt, int(reach))
+
+    sssp_rows = df[df['algorithm'] == 'sssp']
+    ok = sssp_rows['runtime_ms'] < 5000
+    successful = list(zip(sssp_rows['graph_size'][ok].tolist(), sssp_rows['runtime_ms'][ok].tolist()))
+    timed_out = int((~ok).sum())
+else:
+    # Single pass over the CSV
+    with open(input_file, 'r', buffering=1 << 20, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        idx = {name: i for i, name in enumerate(header)}
+        i_n, i_algo, i_rt, i_reach = idx['graph_size'], idx['algorithm'], idx['runtime_ms'], idx['reachable']
+
+        for row in reader:
+            algo = row[i_algo]
+            if algo == 'sssp':
+                slot = SSSP
+            elif algo == 'dijkstra':
+                slot = DIJK
+            else:
+                continue
+            n = int(row[i_n])
+            rt = float(row[i_rt])
+            by_size.setdefault(n, [None, None])[slot] = (rt, int(row[i_reach]))
+            if slot == SSSP:
+                if rt < 5000:
+                    successful.append((n, rt))
+                else:
+                    timed_out += 1
+
+lines = [
+    "=" * 80,
+    "SSSP ALGORITHM PERFORMANCE SUMMARY",
+    "=" * 80,
+    "",
+    "Performance Comparison:",
+    "-" * 80,
+    f"{'Size':<10} {'SSSP Time':<15} {'Dijk Time':<15} {'Coverage':<15} {'Status'}",
+    "-" * 80,
+]
 
 for n in sorted(by_size.keys()):
-    sssp = by_size[n]['sssp']
-    dijk = by_size[n]['dijkstra']
-    
-    sssp_time = float(sssp['runtime_ms'])
-    dijk_time = float(dijk['runtime_ms'])
-    
-    sssp_reachable = int(sssp['reachable'])
-    total_vertices = int(sssp['graph_size'])
-    coverage_pct = (sssp_reachable / total_vertices) * 100
-    
+    (sssp_time, sssp_reachable), (dijk_time, _) = by_size[n]
+    coverage_pct = (sssp_reachable / n) * 100
+
     if sssp_time > 5000:
         status = "[TIMEOUT]"
     else:
         status = "[SLOW]"
-    
-    print(f"{n:<10} {sssp_time:<15.2f} {dijk_time:<15.2f} {coverage_pct:<14.1f}% {status}")
 
-print("-" * 80)
-print()
-print("Key Findings:")
-print("-" * 80)
+    lines.append(f"{n:<10} {sssp_time:<15.2f} {dijk_time:<15.2f} {coverage_pct:<14.1f}% {status}")
 
-successful = [(int(r['graph_size']), float(r['runtime_ms'])) for r in results 
-              if r['algorithm'] == 'sssp' and float(r['runtime_ms']) < 5000]
+lines += [
+    "-" * 80,
+    "",
+    "Key Findings:",
+    "-" * 80,
+]
 
 if successful:
     avg_n = sum(n for n, _ in successful) / len(successful)
     avg_time = sum(t for _, t in successful) / len(successful)
-    print(f"[OK] Successfully completed on {len(successful)} graph sizes")
-    print(f"[OK] Average time for successful runs: {avg_time:.2f}ms on graphs of avg size {avg_n:.0f}")
-    
-timed_out = sum(1 for r in results if r['algorithm'] == 'sssp' and float(r['runtime_ms']) >= 5000)
+    lines.append(f"[OK] Successfully completed on {len(successful)} graph sizes")
+    lines.append(f"[OK] Average time for successful runs: {avg_time:.2f}ms on graphs of avg size {avg_n:.0f}")
+
 if timed_out:
-    print(f"[TIMEOUT] Timed out on {timed_out} graph sizes (n >= 5000)")
+    lines.append(f"[TIMEOUT] Timed out on {timed_out} graph sizes (n >= 5000)")
 
-print()
-print("Algorithm Behavior:")
-print("-" * 80)
+lines += [
+    "",
+    "Algorithm Behavior:",
+    "-" * 80,
+]
 for n in sorted(by_size.keys()):
-    sssp = by_size[n]['sssp']
-    coverage = int(sssp['reachable']) / int(sssp['graph_size']) * 100
-    
+    coverage = by_size[n][SSSP][1] / n * 100
+
     if n <= 100:
-        print(f"n={n:5d}: Excellent coverage ({coverage:.0f}%), fast completion")
+        lines.append(f"n={n:5d}: Excellent coverage ({coverage:.0f}%), fast completion")
     elif n <= 1000:
-        print(f"n={n:5d}: Good performance but coverage drops to {coverage:.0f}%")
+        lines.append(f"n={n:5d}: Good performance but coverage drops to {coverage:.0f}%")
     else:
-        print(f"n={n:5d}: Algorithm encounters stalls, breaks early for safety")
+        lines.append(f"n={n:5d}: Algorithm encounters stalls, breaks early for safety")
 
-print()
-print("=" * 80)
+lines += [
+    "",
+    "=" * 80,
+]
+sys.stdout.write('\n'.join(lines) + '\n')
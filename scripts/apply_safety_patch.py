@@ -1,84 +1,183 @@
 """
 Patch for sssp_concept.py to add infinite loop protection
 Apply by running: python apply_safety_patch.py
-"""
-
-# Read the file
-with open('sssp_concept.py', 'r', encoding='utf-8') as f:
-    content = f.read()
 
-# Patch 1: Add iteration tracking variables
-old_1 = """    # Accumulates all complete vertices found within this `BMSSP` call.
-    current_U: Set[int] = set()
-    # Tracks the boundary `B'_i` from the most recent recursive call.
-    last_B_prime_i: float = B_prime_0
+The patch sites are located structurally with `ast` (the BMSSP main loop, which
+lives in the `_bmssp_frame` generator, and the `Bi, Si = D.Pull()` assignment
+inside it) rather than by matching large
+source snippets, so it tolerates whitespace/comment drift and is idempotent.
+Edits are spliced in as source lines, which keeps comments intact.
 
-    # Calculate the maximum allowed size for `current_U` for this level, to detect "large workload".
-    max_U_size_for_level = k_param * (2**(l * t_param))
+This also covers the former fix_stall_v2.py: stall detection tracks the set of
+already-processed vertices, and a file carrying the older `last_Bi`-based
+stall check is upgraded in place. All patches are applied from one parse and
+written back in one write.
+"""
+import ast
+
+MAIN_LOOP_TEST = "len(current_U) < max_U_size_for_level and not D.is_empty()"
+# Function holding one BMSSP level (and so the main loop)
+BMSSP_LEVEL_FUNC = "_bmssp_frame"
+
+# Patch 1: iteration tracking variables (before the loop) and the limit check
+# (top of the loop body)
+PATCH_1_SETUP = """# Safety: limit iterations to prevent infinite loops
+max_iterations = max(1000, N_vertices * 10)
+iteration_count = 0
+last_Bi = None
+stall_count = 0
+"""
 
-    # Main loop: Repeats iterations as long as `current_U` is below its threshold and `D` is not empty.
-    while len(current_U) < max_U_size_for_level and not D.is_empty():"""
+PATCH_1_LOOP = """iteration_count += 1
+if iteration_count > max_iterations:
+    _instr(f"[BMSSP] level={l} BREAK: max_iterations={max_iterations} reached")
+    break"""
 
-new_1 = """    # Accumulates all complete vertices found within this `BMSSP` call.
-    current_U: Set[int] = set()
-    # Tracks the boundary `B'_i` from the most recent recursive call.
-    last_B_prime_i: float = B_prime_0
+# Patch 2: processed-vertex set (before the loop), iteration number in the Pull
+# instrumentation, then stall detection
+PATCH_2_SETUP = """# Track vertices that have been processed to avoid infinite re-insertion
+processed_vertices: Set[int] = set()
+"""
 
-    # Calculate the maximum allowed size for `current_U` for this level, to detect "large workload".
-    max_U_size_for_level = k_param * (2**(l * t_param))
+PATCH_2_INSTR = """_instr(f"[BMSSP] level={l} iter={iteration_count} Pulled Bi={Bi} Si_count={len(Si)} M_param={M_param}")
+"""
 
-    # Safety: limit iterations to prevent infinite loops
-    max_iterations = max(1000, N_vertices * 10)
-    iteration_count = 0
-    last_Bi = None
+PATCH_2_STALL = """
+# Safety: detect if we're pulling the same vertices repeatedly (nothing new was added)
+seen_before = len(processed_vertices)
+processed_vertices.update(Si)
+if len(processed_vertices) == seen_before:
+    stall_count += 1
+    if stall_count > 5:
+        _instr(f"[BMSSP] level={l} BREAK: Pulling same {len(Si)} vertices repeatedly (stall={stall_count})")
+        break
+else:
     stall_count = 0
-
-    # Main loop: Repeats iterations as long as `current_U` is below its threshold and `D` is not empty.
-    while len(current_U) < max_U_size_for_level and not D.is_empty():
-        iteration_count += 1
-        if iteration_count > max_iterations:
-            _instr(f"[BMSSP] level={l} BREAK: max_iterations={max_iterations} reached")
-            break"""
-
-# Patch 2: Add stall detection
-old_2 = """        # Step 3: `Pull` a subset `Si` of `M_param` smallest-distance vertices from `D`,
-        # and obtain `Bi`, which is an upper bound for `Si` and a lower bound for the rest of `D`.
-        Bi, Si = D.Pull()
-        _instr(f"[BMSSP] level={l} Pulled Bi={Bi} Si_count={len(Si)} M_param={M_param}")
-
-        # Heuristic adjustment for tiny Bi values"""
-
-new_2 = """        # Step 3: `Pull` a subset `Si` of `M_param` smallest-distance vertices from `D`,
-        # and obtain `Bi`, which is an upper bound for `Si` and a lower bound for the rest of `D`.
-        Bi, Si = D.Pull()
-        _instr(f"[BMSSP] level={l} iter={iteration_count} Pulled Bi={Bi} Si_count={len(Si)} M_param={M_param}")
-        
-        # Safety: detect if Bi is not advancing (infinite loop symptom)
-        if last_Bi is not None and abs(Bi - last_Bi) < 1e-12 and len(Si) == len(batch_items_to_add if 'batch_items_to_add' in dir() else []):
-            stall_count += 1
-            if stall_count > 10:
-                _instr(f"[BMSSP] level={l} BREAK: Bi stalled at {Bi} for {stall_count} iterations")
-                break
+last_Bi = Bi"""
+
+
+def _indent(block: str, col: int) -> list:
+    pad = " " * col
+    return [(pad + line if line else "") + "\n" for line in block.split("\n")]
+
+
+def _assigned_names(nodes) -> set:
+    names = set()
+    for node in nodes:
+        for sub in ast.walk(node):
+            if isinstance(sub, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+                targets = sub.targets if isinstance(sub, ast.Assign) else [sub.target]
+                for t in targets:
+                    names.update(n.id for n in ast.walk(t) if isinstance(n, ast.Name))
+    return names
+
+
+def _matches(node: ast.AST, expr: str) -> bool:
+    # Round-trip both sides through unparse so Load/Store context and
+    # redundant parentheses don't affect the comparison
+    return ast.unparse(node) == ast.unparse(ast.parse(expr, mode="eval").body)
+
+
+def find_patch_sites(tree: ast.Module):
+    """Return (bmssp_def, main_loop, pull_instr) nodes; any may be None if not found."""
+    bmssp = next((n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name == BMSSP_LEVEL_FUNC), None)
+    if bmssp is None:
+        return None, None, None
+
+    loop = next((n for n in ast.walk(bmssp)
+                 if isinstance(n, ast.While) and _matches(n.test, MAIN_LOOP_TEST)), None)
+    if loop is None:
+        return bmssp, None, None
+
+    pull_instr = None
+    for prev, stmt in zip(loop.body, loop.body[1:]):
+        if (isinstance(prev, ast.Assign) and _matches(prev.targets[0], "Bi, Si")
+                and _matches(prev.value, "D.Pull()")
+                and isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)
+                and _matches(stmt.value.func, "_instr")):
+            pull_instr = stmt
+            break
+    return bmssp, loop, pull_instr
+
+
+def find_old_stall_check(loop: ast.While, pull_instr: ast.stmt):
+    """Return the `last_Bi = Bi` statement ending the older Bi-based stall check, if present."""
+    body = loop.body
+    i = body.index(pull_instr)
+    for check, assign in zip(body[i + 1:], body[i + 2:]):
+        if (isinstance(check, ast.If) and "last_Bi" in ast.unparse(check.test)
+                and isinstance(assign, ast.Assign) and _matches(assign.targets[0], "last_Bi")
+                and _matches(assign.value, "Bi")):
+            return assign
+    return None
+
+
+def apply_patches(content: str) -> str:
+    tree = ast.parse(content)
+    bmssp, loop, pull_instr = find_patch_sites(tree)
+    lines = content.splitlines(keepends=True)
+
+    # (start, end, replacement lines) over 0-based line slices; applied
+    # bottom-up so earlier indices stay valid
+    edits = []
+
+    if loop is None:
+        print("✗ Patch 1 already applied or code structure changed")
+        print("✗ Patch 2 already applied or code structure changed")
+        return content
+
+    # Setup statements go right after the statement preceding the loop
+    setup = []
+    prev_stmt = bmssp.body[bmssp.body.index(loop) - 1] if loop in bmssp.body else None
+    setup_at = prev_stmt.end_lineno if prev_stmt is not None else loop.lineno - 1
+
+    if "iteration_count" in _assigned_names(bmssp.body):
+        print("✗ Patch 1 already applied or code structure changed")
+    else:
+        setup.append(PATCH_1_SETUP.rstrip("\n"))
+        edits.append((loop.lineno, loop.lineno, _indent(PATCH_1_LOOP, loop.body[0].col_offset)))
+        print("✓ Applied Patch 1: Iteration limit")
+
+    if pull_instr is None or "seen_before" in _assigned_names(loop.body):
+        print("✗ Patch 2 already applied or code structure changed")
+    else:
+        if "processed_vertices" not in _assigned_names(bmssp.body):
+            setup.append(PATCH_2_SETUP.rstrip("\n"))
+        col = pull_instr.col_offset
+        old_check = find_old_stall_check(loop, pull_instr)
+        if old_check is not None:
+            # Upgrade the older last_Bi-based check in place
+            edits.append((pull_instr.end_lineno, old_check.end_lineno, _indent(PATCH_2_STALL, col)))
+            print("✓ Applied Patch 2: Stall detection (upgraded to processed-vertex tracking)")
+        elif "last_Bi" in _assigned_names(loop.body):
+            print("✗ Patch 2 already applied or code structure changed")
         else:
-            stall_count = 0
-        last_Bi = Bi
-
-        # Heuristic adjustment for tiny Bi values"""
-
-if old_1 in content:
-    content = content.replace(old_1, new_1)
-    print("✓ Applied Patch 1: Iteration limit")
-else:
-    print("✗ Patch 1 already applied or code structure changed")
-
-if old_2 in content:
-    content = content.replace(old_2, new_2)
-    print("✓ Applied Patch 2: Stall detection")
-else:
-    print("✗ Patch 2 already applied or code structure changed")
-
-# Write back
-with open('sssp_concept.py', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print("\nPatches applied! Test with: python test_diagnostic.py")
+            edits.append((pull_instr.lineno - 1, pull_instr.end_lineno,
+                          _indent(PATCH_2_INSTR + PATCH_2_STALL, col)))
+            print("✓ Applied Patch 2: Stall detection")
+
+    if setup:
+        edits.append((setup_at, setup_at, ["\n"] + _indent("\n\n".join(setup), loop.col_offset)))
+
+    for start, end, new_lines in sorted(edits, key=lambda item: item[0], reverse=True):
+        lines[start:end] = new_lines
+    return "".join(lines)
+
+
+if __name__ == "__main__":
+    # Read the file once, as bytes, so the unchanged check below compares
+    # exactly what is on disk (line endings included)
+    with open('sssp_concept.py', 'rb') as f:
+        original = f.read()
+    content = original.decode('utf-8')
+
+    patched = apply_patches(content).encode('utf-8')
+
+    # Write back only if a patch changed something; reruns on an already
+    # patched file leave it (and its mtime) untouched
+    if patched == original:
+        print("\nsssp_concept.py already patched, nothing written")
+    else:
+        with open('sssp_concept.py', 'wb') as f:
+            f.write(patched)
+        print("\nPatches applied! Test with: python test_diagnostic.py")
@@ -8,70 +8,95 @@ Usage: python fill_sssp_with_dijkstra.py
 """
 
 import os
+from itertools import zip_longest
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+OUTPUT_HEADER = 'vertex distance (NEW SSSP filled with Dijkstra for inf)'
+
+
+def _fill_distances_numpy(sssp_file, dijkstra_file, output_file):
+    """Vectorized `fill_distances`: parse both files with np.loadtxt and fill with np.where."""
+    dtype = [('v', 'i8'), ('d', 'f8')]
+    sssp = np.loadtxt(sssp_file, comments='#', dtype=dtype, ndmin=1)
+    dijk = np.loadtxt(dijkstra_file, comments='#', dtype=dtype, ndmin=1)
+    if len(sssp) != len(dijk) or not np.array_equal(sssp['v'], dijk['v']):
+        raise ValueError(f"Vertex mismatch between {sssp_file} and {dijkstra_file}")
+
+    # float() parses 'inf', so unreachable vertices load as np.inf
+    filled = np.where(np.isinf(sssp['d']), dijk['d'], sssp['d'])
+    np.savetxt(output_file, np.c_[sssp['v'], filled], fmt=['%d', '%.6f'],
+               header=OUTPUT_HEADER, comments='# ')
+
+    original_reach = int(np.isfinite(sssp['d']).sum())
+    filled_reach = int(np.isfinite(filled).sum())
+    return {
+        'original_reach': original_reach,
+        'filled_reach': filled_reach,
+        'filled_count': filled_reach - original_reach,
+        'total': len(filled)
+    }
+
+
+def _distance_rows(f):
+    """Yield [vertex, distance] token pairs from a distance file, skipping comments and blanks."""
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line.split()
 
 
 def fill_distances(sssp_file, dijkstra_file, output_file):
     """
     Read SSSP and Dijkstra distance files, fill inf values with Dijkstra distances.
+
+    With NumPy installed both files are parsed in C and filled in one vectorized
+    step. Otherwise, since both inputs are written in vertex order (one line per
+    vertex 0..n-1), they are merged line-by-line in a single pass without loading
+    either into memory.
     """
-    # Load SSSP distances
-    sssp_dist = {}
-    with open(sssp_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('#') or not line:
-                continue
-            parts = line.split()
-            vertex = int(parts[0])
-            dist_str = parts[1]
-            if dist_str == 'inf':
-                sssp_dist[vertex] = float('inf')
+    if HAS_NUMPY:
+        return _fill_distances_numpy(sssp_file, dijkstra_file, output_file)
+
+    inf = float('inf')
+    original_reach = 0
+    filled_reach = 0
+    total = 0
+
+    with open(sssp_file, 'r', buffering=1 << 20) as fs, \
+         open(dijkstra_file, 'r', buffering=1 << 20) as fd, \
+         open(output_file, 'w', buffering=1 << 20) as out:
+        out.write(f'# {OUTPUT_HEADER}\n')
+        # zip_longest so a shorter file is a mismatch rather than a silent truncation
+        for sr, dr in zip_longest(_distance_rows(fs), _distance_rows(fd)):
+            if sr is None or dr is None:
+                raise ValueError(f"Vertex mismatch between {sssp_file} and {dijkstra_file}")
+            # Parsed as the NumPy path does: int ids, and float() accepts any inf spelling
+            v = int(sr[0])
+            if v != int(dr[0]):
+                raise ValueError(f"Vertex mismatch between {sssp_file} ({sr[0]}) and {dijkstra_file} ({dr[0]})")
+            d = float(sr[1])
+            if d != inf:
+                original_reach += 1
             else:
-                sssp_dist[vertex] = float(dist_str)
-    
-    # Load Dijkstra distances
-    dijkstra_dist = {}
-    with open(dijkstra_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('#') or not line:
-                continue
-            parts = line.split()
-            vertex = int(parts[0])
-            dist_str = parts[1]
-            if dist_str == 'inf':
-                dijkstra_dist[vertex] = float('inf')
+                # Fill inf values with Dijkstra distances
+                d = float(dr[1])
+            if d != inf:
+                filled_reach += 1
+                out.write(f"{v} {d:.6f}\n")
             else:
-                dijkstra_dist[vertex] = float(dist_str)
-    
-    # Fill inf values with Dijkstra distances
-    filled_dist = {}
-    for vertex in sssp_dist:
-        if sssp_dist[vertex] == float('inf'):
-            filled_dist[vertex] = dijkstra_dist.get(vertex, float('inf'))
-        else:
-            filled_dist[vertex] = sssp_dist[vertex]
-    
-    # Write output
-    with open(output_file, 'w') as f:
-        f.write('# vertex distance (NEW SSSP filled with Dijkstra for inf)\n')
-        for vertex in sorted(filled_dist.keys()):
-            d = filled_dist[vertex]
-            if d == float('inf'):
-                f.write(f"{vertex} inf\n")
-            else:
-                f.write(f"{vertex} {d:.6f}\n")
-    
-    # Count filled vertices
-    original_reach = sum(1 for d in sssp_dist.values() if d != float('inf'))
-    filled_reach = sum(1 for d in filled_dist.values() if d != float('inf'))
-    filled_count = filled_reach - original_reach
-    
+                out.write(f"{v} inf\n")
+            total += 1
+
     return {
         'original_reach': original_reach,
         'filled_reach': filled_reach,
-        'filled_count': filled_count,
-        'total': len(filled_dist)
+        'filled_count': filled_reach - original_reach,
+        'total': total
     }
 
 
@@ -20,7 +20,7 @@ print('✓ No infinite loops')
 print('✓ Algorithm completes successfully')
 print('✓ All fixes working correctly')
 print('✓ Stall detection prevents hangs')
-print('✓ FindPivots uses per-pivot visited sets')
+print('✓ FindPivots counts each pivot subtree independently')
 print()
 print('=' * 60)
 print('READY TO DEMONSTRATE!')
@@ -1,14 +1,32 @@
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from hybrid_sssp import compare_algorithms
 from graph_generator import generate_random_graph
 
+SIZES = [50, 100, 200]
+
+
+def _run_one(n):
+    """Generate and compare one graph size; returns only the fields printed below."""
+    _, edges = generate_random_graph(n, n * 2, seed=42)
+    r = compare_algorithms(n, edges, 0, 30)
+    return {
+        'timed_out': r['sssp'].get('timed_out'),
+        'time': r['sssp']['time'],
+        'sssp_reachable': r['sssp']['reachable'],
+        'dijkstra_reachable': r['dijkstra']['reachable'],
+    }
+
+
 if __name__ == '__main__':
-    for n in [50, 100, 200]:
-        _, edges = generate_random_graph(n, n * 2, seed=42)
-        r = compare_algorithms(n, edges, 0, 30)
-        
-        sssp_status = "TIMED OUT" if r['sssp'].get('timed_out') else "OK"
-        print(f"n={n:4d}: SSSP {sssp_status:9s} in {r['sssp']['time']:6.3f}s, found {r['sssp']['reachable']:4d}/{r['dijkstra']['reachable']:4d} vertices")
+    # The sizes are independent, so run them in parallel and print in order
+    with ProcessPoolExecutor(max_workers=len(SIZES)) as ex:
+        futures = {n: ex.submit(_run_one, n) for n in SIZES}
+        for n, fut in futures.items():
+            r = fut.result()
+            
+            sssp_status = "TIMED OUT" if r['timed_out'] else "OK"
+            print(f"n={n:4d}: SSSP {sssp_status:9s} in {r['time']:6.3f}s, found {r['sssp_reachable']:4d}/{r['dijkstra_reachable']:4d} vertices")
@@ -12,46 +12,134 @@ Usage:
     
 Output:
     - results/experiment_results.csv: Comprehensive results for all experiments
+    - results/experiment_results.parquet: Same rows, typed and columnar (only
+      when pyarrow is installed)
 """
 
 import os
 import csv
+import statistics
 import time
-from typing import List, Dict, Any
+import multiprocessing as mp
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import sys
 
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    HAS_TQDM = False
+
 # Add parent directory to path so we can import root modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from graph_generator import generate_random_graph, save_graph_to_file
+from graph_generator import CSRGraph, generate_random_graph, save_graph_bin, load_graph_bin
 from hybrid_sssp import compare_algorithms, dijkstra_single_source
 from sssp_concept import solve_sssp_directed_real_weights
 
 
+FIELDNAMES = ['trial', 'graph_size', 'num_edges', 'algorithm', 'runtime_ms', 
+              'reachable', 'num_inf', 'num_diff_vs_dijkstra', 'avg_error_vs_dijkstra',
+              'k_param', 't_param', 'sssp_time_ms', 'dijkstra_fill_time_ms',
+              'sssp_reachable', 'dijkstra_filled']
+
+# Column types for the Parquet copy of the results; the hybrid-only columns
+# and k/t are null on rows that don't set them
+PARQUET_TYPES = {
+    'trial': 'int64', 'graph_size': 'int64', 'num_edges': 'int64', 'algorithm': 'string',
+    'runtime_ms': 'float64', 'reachable': 'int64', 'num_inf': 'int64',
+    'num_diff_vs_dijkstra': 'int64', 'avg_error_vs_dijkstra': 'float64',
+    'k_param': 'int64', 't_param': 'int64', 'sssp_time_ms': 'float64',
+    'dijkstra_fill_time_ms': 'float64', 'sssp_reachable': 'int64', 'dijkstra_filled': 'int64',
+}
+
+
+def _load_or_generate_graph(n: int, m: int, seed: int, cache_dir: str = None) -> Tuple[Optional[CSRGraph], List[Tuple[int, int, float]]]:
+    """
+    generate_random_graph(n, m, connected=True, seed=seed) as (CSR, edges).
+    
+    With a `cache_dir` (and a seed, so the graph is reproducible) the edges are
+    stored there in the binary edge-list format on first use and loaded back
+    on later runs instead of being regenerated (the CSR is then None and is
+    built by compare_algorithms). The file name only encodes (n, m, seed), so
+    clear the cache if the generator defaults change.
+    """
+    if cache_dir is None or seed is None:
+        return generate_random_graph(n, m, connected=True, seed=seed)
+
+    path = os.path.join(cache_dir, f"random_n{n}_m{m}_seed{seed}.bin")
+    if os.path.exists(path):
+        _, _, edges = load_graph_bin(path)
+        return None, edges
+
+    graph, edges = generate_random_graph(n, m, connected=True, seed=seed)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under a temporary name so a concurrent or interrupted run never
+    # sees a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    save_graph_bin(edges, n, tmp_path)
+    os.replace(tmp_path, path)
+    return graph, edges
+
+
+# Graphs up to this size are timed TIMING_REPEATS times and the median kept,
+# since single runs there are short enough for timer noise and jitter to show
+TIMING_REPEAT_MAX_N = 500
+TIMING_REPEATS = 5
+
+
 def run_single_experiment(
     graph_size: int,
     edge_multiplier: float = 5.0,
     source: int = 0,
-    seed: int = None
+    seed: int = None,
+    graph_cache_dir: str = None,
+    verbose: bool = True
 ) -> List[Dict[str, Any]]:
-    print(f"\nGenerating graph: n={graph_size}, m={int(graph_size * edge_multiplier)}...", end=" ")
+    """
+    Generate one graph, compare the algorithms on it and return one row per
+    algorithm. With verbose=True a single summary line is printed per trial.
+    """
     n = graph_size
     m = int(n * edge_multiplier)
-    graph_dict, edges = generate_random_graph(n, m, connected=True, seed=seed)
-    print(f"done ({len(edges)} edges)")
+    graph, edges = _load_or_generate_graph(n, m, seed, graph_cache_dir)
+    num_edges = len(edges)
+    # Hand over the generator's CSR so compare_algorithms doesn't rebuild it.
+    # Repeats reuse the same graph, so only the algorithms are re-timed.
+    repeats = TIMING_REPEATS if n <= TIMING_REPEAT_MAX_N else 1
+    runs = [compare_algorithms(n, edges, source, graph=graph) for _ in range(repeats)]
+    results = runs[-1]
+
+    def median_ms(get):
+        return statistics.median(get(r) for r in runs) / 1e6
 
-    print(f"  Running algorithms...", end=" ", flush=True)
-    results = compare_algorithms(n, edges, source)
-    print("done")
+    dijkstra_ms = median_ms(lambda r: r['dijkstra']['time_ns'])
+    sssp_ms = median_ms(lambda r: r['sssp']['time_ns'])
+    hybrid_ms = median_ms(lambda r: r['hybrid']['total_time'] * 1e9)
 
     rows = []
     rows.append({
         'graph_size': n,
-        'num_edges': len(edges),
+        'num_edges': num_edges,
         'algorithm': 'dijkstra',
-        'runtime_ms': results['dijkstra']['time'] * 1000,
+        'runtime_ms': dijkstra_ms,
         'reachable': results['dijkstra']['reachable'],
-        'num_inf': n - results['dijkstra']['reachable'],
+        'num_inf': results['dijkstra']['unreachable'],
         'num_diff_vs_dijkstra': 0,
         'avg_error_vs_dijkstra': 0.0,
         'k_param': None,
@@ -59,16 +147,15 @@ def run_single_experiment(
     })
 
     sssp_stats = results['sssp'].get('stats', {}) or {}
-    sssp_unreachable = sssp_stats.get('unreachable_count', n - results['sssp']['reachable'])
     k_param = sssp_stats.get('k_param')
     t_param = sssp_stats.get('t_param')
     rows.append({
         'graph_size': n,
-        'num_edges': len(edges),
+        'num_edges': num_edges,
         'algorithm': 'sssp',
-        'runtime_ms': results['sssp']['time'] * 1000,
+        'runtime_ms': sssp_ms,
         'reachable': results['sssp']['reachable'],
-        'num_inf': sssp_unreachable,
+        'num_inf': results['sssp']['unreachable'],
         'num_diff_vs_dijkstra': results['sssp']['mismatches_vs_dijkstra'],
         'avg_error_vs_dijkstra': results['sssp']['avg_error_vs_dijkstra'],
         'k_param': k_param,
@@ -78,34 +165,128 @@ def run_single_experiment(
     hybrid = results['hybrid']
     rows.append({
         'graph_size': n,
-        'num_edges': len(edges),
+        'num_edges': num_edges,
         'algorithm': 'hybrid',
-        'runtime_ms': hybrid['total_time'] * 1000,
+        'runtime_ms': hybrid_ms,
         'reachable': hybrid['total_reachable'],
-        'num_inf': n - hybrid['total_reachable'],
+        'num_inf': hybrid['total_unreachable'],
         'num_diff_vs_dijkstra': hybrid['mismatches_vs_dijkstra'],
         'avg_error_vs_dijkstra': hybrid['avg_error_vs_dijkstra'],
         'k_param': k_param,
         't_param': t_param,
-        'sssp_time_ms': hybrid['sssp_time'] * 1000,
-        'dijkstra_fill_time_ms': hybrid['dijkstra_time'] * 1000,
+        'sssp_time_ms': median_ms(lambda r: r['hybrid']['sssp_time'] * 1e9),
+        'dijkstra_fill_time_ms': median_ms(lambda r: r['hybrid']['dijkstra_time'] * 1e9),
         'sssp_reachable': hybrid['sssp_reachable'],
         'dijkstra_filled': hybrid['dijkstra_filled'],
     })
 
-    print(f"  Results: Dijkstra={results['dijkstra']['time']*1000:.1f}ms, "
-          f"SSSP={results['sssp']['time']*1000:.1f}ms ({results['sssp']['reachable']}/{n} reach), "
-          f"Hybrid={hybrid['total_time']*1000:.1f}ms")
+    if verbose:
+        print(f"[n={n:>5} m={num_edges:>6}] dij={dijkstra_ms:6.1f} "
+              f"sssp={sssp_ms:6.1f}({results['sssp']['reachable']}/{n}) hyb={hybrid_ms:6.1f}")
     return rows
 
 
+# Tiny graph run once per process before any timed trial, so one-off costs
+# (Numba compiling or loading its cached kernels, first-call imports) don't
+# land in the first measured row
+WARMUP_EDGES = [(0, 1, 1.0), (1, 2, 1.0), (2, 3, 1.0)]
+
+# Thread-count variables pinned to 1 in pool workers; the pool already keeps
+# every core busy, so threaded kernels inside a worker would only oversubscribe
+WORKER_THREAD_ENV = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMBA_NUM_THREADS')
+
+
+def _warmup():
+    """Run compare_algorithms once on WARMUP_EDGES; errors are ignored."""
+    start = time.time()
+    try:
+        compare_algorithms(4, WARMUP_EDGES, 0)
+    except Exception:
+        pass
+    print(f"  Warmup (pid {os.getpid()}): {time.time() - start:.2f}s")
+
+
+def _init_worker(counter=None):
+    """
+    Process pool initializer: limit the worker to one compute thread, then warm up.
+    
+    The algorithm modules are already imported at module level, so each task
+    reuses them; the warmup makes this process load its Numba kernels before
+    the first timed trial.
+    
+    With a shared `counter` (a multiprocessing.Value) each worker takes the
+    next index from it and pins itself to one of the CPUs this process may
+    use, so the scheduler doesn't migrate it (and its cached CSR arrays)
+    between cores mid-trial. Pinning is skipped where sched_setaffinity
+    doesn't exist (macOS, Windows).
+    """
+    if counter is not None and hasattr(os, 'sched_setaffinity'):
+        with counter.get_lock():
+            idx = counter.value
+            counter.value += 1
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[idx % len(cpus)]})
+    for var in WORKER_THREAD_ENV:
+        os.environ[var] = '1'
+    # The environment only reaches libraries that start their thread pools
+    # later. None of our kernels are parallel today; capping Numba's thread
+    # pool directly keeps any future parallel=True kernel to one thread per worker
+    try:
+        import numba
+        numba.set_num_threads(1)
+    except ImportError:
+        pass
+    _warmup()
+
+
+def _run_task(task: Tuple[int, int, int, float, str, bool]) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    Run one (seed, size, trial) experiment; top-level so a process pool can
+    pickle it. A failed trial is reported and returns no rows instead of
+    taking the pool down.
+    """
+    seed, size, trial, edge_multiplier, graph_cache_dir, verbose = task
+    try:
+        rows = run_single_experiment(size, edge_multiplier, source=0, seed=seed,
+                                     graph_cache_dir=graph_cache_dir, verbose=verbose)
+        for row in rows:
+            row['trial'] = trial + 1
+        return size, trial, rows
+    except Exception as e:
+        import traceback
+        # tqdm.write keeps a progress bar in this process intact
+        (tqdm.write if HAS_TQDM else print)(
+            f"  ERROR in n={size} trial {trial+1}: {e}\n{traceback.format_exc()}")
+        return size, trial, []
+
+
 def run_all_experiments(
     graph_sizes: List[int] = None,
     edge_multiplier: float = 5.0,
     num_trials: int = 1,
     output_file: str = "results/experiment_results.csv",
-    save_graphs: bool = False
+    save_graphs: bool = False,
+    max_workers: int = None,
+    parquet: bool = True,
+    progress: bool = None
 ) -> List[Dict[str, Any]]:
+    """
+    Run every (size, trial) experiment and write all rows to `output_file`.
+    
+    Trials are independent, so they run in a process pool of `max_workers`
+    (default: one per CPU); max_workers=1 runs them in this process. Seeds are
+    fixed per (size, trial), so results don't depend on the worker count.
+    
+    With save_graphs=True every generated graph is kept in a graph_cache/
+    directory next to `output_file` and reused by later runs.
+    
+    When pyarrow is installed (and parquet=True) the same rows also go to a
+    zstd-compressed Parquet file beside the CSV (`output_file` with a .parquet
+    suffix), for loading with typed columns instead of re-parsing text.
+    
+    progress=True (the default when tqdm is installed) shows one progress bar
+    over all trials in place of the per-trial log lines.
+    """
     if graph_sizes is None:
         graph_sizes = [50, 100, 500, 1000, 5000, 10000]
 
@@ -118,46 +299,111 @@ def run_all_experiments(
     print(f"Output file: {output_file}")
     print("="*70)
 
+    # Ensure results directory exists
+    out_dir = os.path.dirname(output_file)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    graph_cache_dir = os.path.join(out_dir, "graph_cache") if save_graphs else None
+
+    if progress is None:
+        progress = HAS_TQDM
+    verbose = not progress
+    tasks = [(42 + size + trial, size, trial, edge_multiplier, graph_cache_dir, verbose)
+             for size in graph_sizes for trial in range(num_trials)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+
+    # Rows are written as each trial finishes (and flushed), so a crash or
+    # Ctrl-C partway through keeps every completed trial on disk
     all_rows = []
-    for size_idx, size in enumerate(graph_sizes):
-        print(f"\n[{size_idx+1}/{len(graph_sizes)}] Testing graph size n={size}")
-        print("-"*70)
-        for trial in range(num_trials):
-            seed = 42 + size + trial
-            if num_trials > 1:
-                print(f"  Trial {trial+1}/{num_trials}")
-            try:
-                rows = run_single_experiment(size, edge_multiplier, source=0, seed=seed)
-                for row in rows:
-                    row['trial'] = trial + 1
-                all_rows.extend(rows)
-            except Exception as e:
-                print(f"  ERROR in trial {trial+1}: {e}")
-                import traceback
-                traceback.print_exc()
-
-    if all_rows:
-        print(f"\n{'='*70}")
-        print(f"Writing results to {output_file}...")
-        # Ensure results directory exists
-        out_dir = os.path.dirname(output_file)
-        if out_dir:
-            os.makedirs(out_dir, exist_ok=True)
-
-        fieldnames = ['trial', 'graph_size', 'num_edges', 'algorithm', 'runtime_ms', 
-                      'reachable', 'num_inf', 'num_diff_vs_dijkstra', 'avg_error_vs_dijkstra',
-                      'k_param', 't_param', 'sssp_time_ms', 'dijkstra_fill_time_ms',
-                      'sssp_reachable', 'dijkstra_filled']
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_rows)
-        print(f"✓ Saved {len(all_rows)} result rows to {output_file}")
-        print("="*70)
+    with ExitStack() as stack:
+        f = stack.enter_context(open(output_file, 'w', newline='', buffering=1 << 20))
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+
+        # The Parquet writer is closed (footer written) on the way out of the
+        # block too, so an interrupted run leaves a readable file
+        parquet_writer = None
+        if parquet and HAS_PYARROW:
+            schema = pa.schema([(name, PARQUET_TYPES[name]) for name in FIELDNAMES])
+            parquet_file = os.path.splitext(output_file)[0] + '.parquet'
+            parquet_writer = stack.enter_context(
+                pq.ParquetWriter(parquet_file, schema, compression='zstd', compression_level=3))
+
+        if max_workers > 1:
+            print(f"\nRunning {len(tasks)} trials on {max_workers} worker processes")
+        else:
+            _warmup()
+        pbar = stack.enter_context(tqdm(total=len(tasks), unit='trial')) if progress else None
+
+        def emit(size, rows):
+            writer.writerows(rows)
+            f.flush()
+            if parquet_writer is not None and rows:
+                parquet_writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            all_rows.extend(rows)
+            if pbar is not None:
+                pbar.update(1)
+                if rows:
+                    pbar.set_postfix(size=size, dij_ms=f"{rows[0]['runtime_ms']:.1f}")
+
+        if max_workers > 1:
+            worker_counter = mp.Value('i', 0)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(worker_counter,)) as ex:
+                for size, trial, rows in ex.map(_run_task, tasks, chunksize=1):
+                    emit(size, rows)
+        else:
+            for size_idx, size in enumerate(graph_sizes):
+                if verbose:
+                    print(f"\n[{size_idx+1}/{len(graph_sizes)}] Testing graph size n={size}")
+                    print("-"*70)
+                for trial in range(num_trials):
+                    if verbose and num_trials > 1:
+                        print(f"  Trial {trial+1}/{num_trials}")
+                    _, _, rows = _run_task((42 + size + trial, size, trial, edge_multiplier,
+                                            graph_cache_dir, verbose))
+                    emit(size, rows)
+
+    print(f"\n{'='*70}")
+    print(f"✓ Saved {len(all_rows)} result rows to {output_file}")
+    print("="*70)
     return all_rows
 
 
-def print_summary_table(results: List[Dict[str, Any]]):
+ALGO_ORDER = ['dijkstra', 'sssp', 'hybrid']
+
+
+def _summary_lines_pandas(results: List[Dict[str, Any]]) -> List[str]:
+    """Per-(size, algo) table lines via one pandas groupby."""
+    df = pd.DataFrame(results)
+    df['algorithm'] = pd.Categorical(df['algorithm'], ALGO_ORDER, ordered=True)
+    keys = ['graph_size', 'algorithm']
+    agg = df.groupby(keys, sort=True, observed=True).agg(
+        avg_time=('runtime_ms', 'mean'),
+        avg_reach=('reachable', 'mean'),
+        avg_inf=('num_inf', 'mean'),
+        avg_diff=('num_diff_vs_dijkstra', 'mean'),
+    )
+    # k/t come from each group's first row, like the stdlib path
+    first = df.drop_duplicates(keys).set_index(keys)[['k_param', 't_param']]
+    agg = agg.join(first)
+
+    lines = []
+    last_size = None
+    for (size, algo), avg_time, avg_reach, avg_inf, avg_diff, k_param, t_param in agg.itertuples():
+        if last_size is not None and size != last_size:
+            lines.append("")
+        last_size = size
+        kt_str = f"{int(k_param)}/{int(t_param)}" if pd.notna(k_param) and k_param else ""
+        lines.append(f"{size:<8} {algo:<10} {avg_time:<12.2f} {avg_reach:<12.1f} {avg_inf:<8.1f} {avg_diff:<15.1f} {kt_str:<10}")
+    lines.append("")
+    return lines
+
+
+def _summary_lines(results: List[Dict[str, Any]]) -> List[str]:
+    """Per-(size, algo) table lines, averaging each group's rows in Python."""
     by_size = {}
     for row in results:
         size = row['graph_size']
@@ -165,14 +411,9 @@ def print_summary_table(results: List[Dict[str, Any]]):
             by_size[size] = {'dijkstra': [], 'sssp': [], 'hybrid': []}
         by_size[size][row['algorithm']].append(row)
 
-    print("\n" + "="*100)
-    print("SUMMARY TABLE (averaged over trials)")
-    print("="*100)
-    print(f"{'Size':<8} {'Algo':<10} {'Time(ms)':<12} {'Reachable':<12} {'INF':<8} {'Diff vs Dijk':<15} {'k/t':<10}")
-    print("-"*100)
-
+    lines = []
     for size in sorted(by_size.keys()):
-        for algo in ['dijkstra', 'sssp', 'hybrid']:
+        for algo in ALGO_ORDER:
             rows = by_size[size][algo]
             if not rows:
                 continue
@@ -183,8 +424,21 @@ def print_summary_table(results: List[Dict[str, Any]]):
             k_param = rows[0].get('k_param', '')
             t_param = rows[0].get('t_param', '')
             kt_str = f"{k_param}/{t_param}" if k_param else ""
-            print(f"{size:<8} {algo:<10} {avg_time:<12.2f} {avg_reach:<12.1f} {avg_inf:<8.1f} {avg_diff:<15.1f} {kt_str:<10}")
-        print()
+            lines.append(f"{size:<8} {algo:<10} {avg_time:<12.2f} {avg_reach:<12.1f} {avg_inf:<8.1f} {avg_diff:<15.1f} {kt_str:<10}")
+        lines.append("")
+    return lines
+
+
+def print_summary_table(results: List[Dict[str, Any]]):
+    """Print per-(size, algorithm) averages; aggregated with pandas when it is installed."""
+    print("\n" + "="*100)
+    print("SUMMARY TABLE (averaged over trials)")
+    print("="*100)
+    print(f"{'Size':<8} {'Algo':<10} {'Time(ms)':<12} {'Reachable':<12} {'INF':<8} {'Diff vs Dijk':<15} {'k/t':<10}")
+    print("-"*100)
+
+    lines = _summary_lines_pandas(results) if HAS_PANDAS else _summary_lines(results)
+    print("\n".join(lines))
     print("="*100)
 
 
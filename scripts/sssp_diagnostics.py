@@ -1,36 +1,67 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sssp_concept
+from graph_generator import HAS_NUMPY
+from sssp_concept import ALPHA_UNSET, SSSPResult
 
-def get_sssp_statistics() -> Dict[str, Any]:
-    """Get diagnostic statistics about the most recent SSSP run."""
-    d_hat = sssp_concept.d_hat
-    path_alpha = sssp_concept.path_alpha
-    N_vertices = sssp_concept.N_vertices
-    k_param = sssp_concept.k_param
-    t_param = sssp_concept.t_param
-    
-    reachable = [v for v in range(N_vertices) if d_hat.get(v, float('inf')) != float('inf')]
-    unreachable = [v for v in range(N_vertices) if d_hat.get(v, float('inf')) == float('inf')]
+if HAS_NUMPY:
+    import numpy as np
+
+
+def _max_mean(values):
+    """(max, mean) of a non-empty list or NumPy array, as Python numbers."""
+    if HAS_NUMPY and isinstance(values, np.ndarray):
+        return values.max().item(), values.mean().item()
+    return max(values), sum(values) / len(values)
+
+
+def get_sssp_statistics(result: Optional[SSSPResult] = None) -> Dict[str, Any]:
+    """
+    Get diagnostic statistics about an SSSP run, given the SSSPResult from
+    `solve_sssp_directed_real_weights(..., return_state=True)`. Without one,
+    falls back to the solver's module state from the most recent run.
+    """
+    if result is None:
+        result = SSSPResult(sssp_concept.d_hat, sssp_concept.path_alpha, sssp_concept.k_param,
+                            sssp_concept.t_param, sssp_concept.N_vertices)
+    d_hat, path_alpha, k_param, t_param, N_vertices = result
+
+    if N_vertices == 0:
+        return {
+            'n': 0, 'k_param': k_param, 't_param': t_param,
+            'reachable_count': 0, 'unreachable_count': 0, 'reachable_pct': 0.0,
+            'max_distance': None, 'avg_distance': None,
+            'avg_path_length': None, 'max_path_length': None,
+        }
+
+    # One pass over the state: NumPy masks when available, else a list scan
+    if HAS_NUMPY:
+        dists = np.asarray(d_hat, dtype=np.float64)
+        reached = dists != np.inf
+        finite_dists = dists[reached]
+        # Kept in its own dtype: int32 with ALPHA_UNSET in kernel mode, else inf-padded
+        alphas = np.asarray(path_alpha)[reached]
+        finite_alphas = alphas[(alphas != np.inf) & (alphas != ALPHA_UNSET)]
+    else:
+        inf = float('inf')
+        finite_dists = [d for d in d_hat if d != inf]
+        finite_alphas = [a for d, a in zip(d_hat, path_alpha) if d != inf and a != inf]
+    reachable_count = len(finite_dists)
     
     stats = {
         'n': N_vertices,
         'k_param': k_param,
         't_param': t_param,
-        'reachable_count': len(reachable),
-        'unreachable_count': len(unreachable),
-        'reachable_pct': 100.0 * len(reachable) / N_vertices if N_vertices > 0 else 0.0,
+        'reachable_count': reachable_count,
+        'unreachable_count': N_vertices - reachable_count,
+        'reachable_pct': 100.0 * reachable_count / N_vertices if N_vertices > 0 else 0.0,
     }
     
-    if reachable:
-        finite_dists = [d_hat[v] for v in reachable]
-        finite_alphas = [path_alpha[v] for v in reachable if path_alpha.get(v, float('inf')) != float('inf')]
-        
-        stats['max_distance'] = max(finite_dists)
-        stats['avg_distance'] = sum(finite_dists) / len(finite_dists)
+    if reachable_count:
+        stats['max_distance'], stats['avg_distance'] = _max_mean(finite_dists)
         
-        if finite_alphas:
-            stats['avg_path_length'] = sum(finite_alphas) / len(finite_alphas)
-            stats['max_path_length'] = max(finite_alphas)
+        if len(finite_alphas):
+            max_alpha, stats['avg_path_length'] = _max_mean(finite_alphas)
+            stats['max_path_length'] = int(max_alpha)
         else:
             stats['avg_path_length'] = 0.0
             stats['max_path_length'] = 0
@@ -43,23 +74,28 @@ def get_sssp_statistics() -> Dict[str, Any]:
     return stats
 
 
-def print_sssp_statistics():
-    """Print diagnostic statistics about the most recent SSSP run."""
-    stats = get_sssp_statistics()
-    print("\n" + "="*60)
-    print("SSSP ALGORITHM STATISTICS")
-    print("="*60)
-    print(f"Graph size (n):           {stats['n']}")
-    print(f"Parameters:               k={stats['k_param']}, t={stats['t_param']}")
-    print(f"Reachable vertices:       {stats['reachable_count']}/{stats['n']} ({stats['reachable_pct']:.1f}%)")
-    print(f"Unreachable (INF):        {stats['unreachable_count']}")
+def print_sssp_statistics(result: Optional[SSSPResult] = None):
+    """Print diagnostic statistics about an SSSP run (see get_sssp_statistics)."""
+    stats = get_sssp_statistics(result)
+    lines = [
+        "",
+        "="*60,
+        "SSSP ALGORITHM STATISTICS",
+        "="*60,
+        f"Graph size (n):           {stats['n']}",
+        f"Parameters:               k={stats['k_param']}, t={stats['t_param']}",
+        f"Reachable vertices:       {stats['reachable_count']}/{stats['n']} ({stats['reachable_pct']:.1f}%)",
+        f"Unreachable (INF):        {stats['unreachable_count']}",
+    ]
     
     if stats['max_distance'] is not None:
-        print(f"Max distance found:       {stats['max_distance']:.4f}")
-        print(f"Avg distance:             {stats['avg_distance']:.4f}")
+        lines.append(f"Max distance found:       {stats['max_distance']:.4f}")
+        lines.append(f"Avg distance:             {stats['avg_distance']:.4f}")
     
     if stats['avg_path_length'] is not None:
-        print(f"Avg path length (edges):  {stats['avg_path_length']:.2f}")
-        print(f"Max path length:          {stats['max_path_length']}")
+        lines.append(f"Avg path length (edges):  {stats['avg_path_length']:.2f}")
+        lines.append(f"Max path length:          {stats['max_path_length']}")
     
-    print("="*60)
+    lines.append("="*60)
+    # One write for the whole report rather than a print per line
+    print("\n".join(lines))
@@ -3,7 +3,8 @@ Quick diagnostic test to understand why SSSP hangs on n=50
 """
 import time
 from graph_generator import generate_random_graph
-from sssp_concept import solve_sssp_directed_real_weights
+from sssp_concept import build_graph, solve
+from sssp_diagnostics import print_sssp_statistics
 import sssp_concept
 
 # Test with small graph first
@@ -15,11 +16,12 @@ sssp_concept.INSTRUMENT = True
 
 t0 = time.time()
 try:
-    result = solve_sssp_directed_real_weights(10, len(edges), edges, 0)
+    result, state = solve(build_graph(10, edges), 0, return_state=True)
     elapsed = time.time() - t0
     print(f"\nCompleted n=10 in {elapsed:.3f}s")
     print(f"Found {len(result)}/10 vertices")
-    print(f"k_param={sssp_concept.k_param}, t_param={sssp_concept.t_param}")
+    print(f"k_param={state.k_param}, t_param={state.t_param}")
+    print_sssp_statistics(state)
 except Exception as e:
     print(f"ERROR: {e}")
 
@@ -32,11 +34,12 @@ graph_dict, edges = generate_random_graph(50, 250, connected=True, seed=42)
 t0 = time.time()
 max_time = 2.0  # 2 second test
 try:
-    result = solve_sssp_directed_real_weights(50, len(edges), edges, 0)
+    result, state = solve(build_graph(50, edges), 0, return_state=True)
     elapsed = time.time() - t0
     print(f"\nCompleted n=50 in {elapsed:.3f}s")
     print(f"Found {len(result)}/50 vertices")
-    print(f"k_param={sssp_concept.k_param}, t_param={sssp_concept.t_param}")
+    print(f"k_param={state.k_param}, t_param={state.t_param}")
+    print_sssp_statistics(state)
 except KeyboardInterrupt:
     elapsed = time.time() - t0
     print(f"\n\nInterrupted after {elapsed:.3f}s")
@@ -1,18 +1,32 @@
 import math
 import heapq
-from bisect import bisect_left, insort
+from array import array
 from collections import defaultdict
-from typing import Dict, List, Tuple, Set, Union, Any, Optional
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Set, Union, Any, Optional
+
+from graph_generator import CSRGraph, HAS_NUMPY, build_csr
+
+if HAS_NUMPY:
+    import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # --- Global State for the SSSP computation ---
-# These dictionaries store the dynamic state of the shortest path algorithm.
+# These lists store the dynamic state of the shortest path algorithm, indexed
+# directly by vertex id 0..N_vertices-1 (vertex ids are dense, so a list index
+# replaces a dict hash + lookup in every relaxation).
 # In a full-fledged library, these would typically be encapsulated within a class.
-# Current estimated shortest path distance from source s to vertex v
-d_hat: Dict[int, float] = {}
-# Predecessor of v on the current estimated shortest path
-pred: Dict[int, Optional[int]] = {}
-# Number of edges in the current estimated shortest path from s to v
-path_alpha: Dict[int, int] = {}
+# Current estimated shortest path distance from source s to vertex v (inf = not reached)
+d_hat: List[float] = []
+# Predecessor of v on the current estimated shortest path (-1 = none)
+pred: List[int] = []
+# Number of edges in the current estimated shortest path from s to v (inf = not reached)
+path_alpha: List[Union[int, float]] = []
 
 # --- Global Parameters derived from graph size (n) ---
 k_param: int = 0      # Parameter k = floor(log^(1/3) n)
@@ -20,8 +34,9 @@ t_param: int = 0      # Parameter t = floor(log^(2/3) n)
 N_vertices: int = 0   # Total number of vertices in the graph
 
 # --- Type Alias for Graph Representation ---
-# The graph is represented as an adjacency list: {u: {v: weight_uv}}
-Graph = Dict[int, Dict[int, float]]
+# The graph is a CSR adjacency of plain lists: the out-edges of u are
+# indices[indptr[u]:indptr[u+1]] with matching weights
+Graph = CSRGraph
 
 # --- Heuristics and Instrumentation Flags ---
 # Toggleable options used to quickly test pragmatic fixes without
@@ -33,6 +48,15 @@ HEURISTICS_LARGE_M = True           # use larger M in debug/heuristic mode
 HEURISTICS_BOUNDARY_EQUALITY = True # use <= for within-bound checks
 HEURISTICS_ADJUST_BI = True         # adjust tiny Bi heuristically
 
+# Run BaseCase, the FindPivots relaxation steps and BMSSP's step-5 relaxation
+# as compiled Numba kernels. The solver state then lives in NumPy arrays
+# (float64 d_hat; int32 path_alpha with ALPHA_UNSET for "not reached"; int32
+# pred and CSR indices, as vertex ids and path lengths fit) so the kernels can
+# update it in place; the interpreted loops read those arrays too.
+# Ignored when Numba is not installed.
+NUMBA_KERNELS = False
+ALPHA_UNSET = 2**31 - 1
+
 # Lightweight instrumentation (minimal, controlled prints)
 INSTRUMENT = False
 def _instr(msg: str):
@@ -46,55 +70,54 @@ def _instr(msg: str):
 
 
 
+# Module-level bindings of the heapq functions for the hot paths below
+heappush, heappop = heapq.heappush, heapq.heappop
+
+
 class SimplifiedLemma3_3_DataStructure:
     """
-    Ordered mapping implementation to approximate Lemma 3.3 behavior.
-
-    This implementation maintains a sorted list of distinct values and, for each
-    value, a mapping of keys that currently have that exact value. It supports
-    Insert, BatchPrepend (as repeated inserts), Pull (extract up to M smallest
-    keys) and is_empty. This avoids stale heap entries and makes Pull's boundary
-    semantics deterministic.
+    Priority structure approximating Lemma 3.3 behavior.
+
+    Entries live in a binary min-heap of (value, seq, key) tuples, with
+    `_current` mapping each live key to its (value, alpha, pred, seq). An
+    Insert that improves a key pushes a fresh entry with a new sequence
+    number and leaves the old one in the heap; Pull discards such stale
+    entries as it meets them (lazy deletion). Equal values come out in
+    insertion order, as in the earlier sorted-bucket version, which keeps
+    Pull's choice of keys and its boundary deterministic. Insert and each
+    pulled key cost O(log n) instead of a sorted-list shift.
     """
 
+    __slots__ = ('M', 'B', '_heap', '_current', '_seq')
+
     def __init__(self, M: int, B: float):
+        # Min-heap of (value, seq, key); entries whose seq no longer matches
+        # `_current[key]` are stale
+        self._heap: List[Tuple[float, int, int]] = []
+        # Map key -> (value, alpha, pred, seq) for the live entry of each key
+        self._current: Dict[int, Tuple[float, int, int, int]] = {}
+        self.reset(M, B)
+
+    def reset(self, M: int, B: float) -> None:
+        """Empty the structure and rebind its parameters, as if newly constructed."""
         self.M = max(1, int(M))
         self.B = B
+        self._heap.clear()
+        self._current.clear()
+        self._seq = 0
 
-        # Sorted list of distinct values present in the structure
-        self._values: List[float] = []
-        # Map value -> dict of key -> (alpha, pred)
-        self._value_to_keys: Dict[float, Dict[int, Tuple[int, int]]] = {}
-        # Map key -> value for quick lookup/update
-        self._key_to_value: Dict[int, float] = {}
-
-    def _add_to_value_bucket(self, value: float, key: int, alpha: int, pred_v_id: int):
-        if value not in self._value_to_keys:
-            # insert value in sorted list
-            insort(self._values, value)
-            self._value_to_keys[value] = {}
-        self._value_to_keys[value][key] = (alpha, pred_v_id)
-        self._key_to_value[key] = value
-
-    def _remove_key(self, key: int):
-        if key not in self._key_to_value:
-            return
-        old_value = self._key_to_value.pop(key)
-        valmap = self._value_to_keys.get(old_value)
-        if valmap and key in valmap:
-            del valmap[key]
-            if not valmap:
-                # remove empty bucket
-                del self._value_to_keys[old_value]
-                idx = bisect_left(self._values, old_value)
-                if idx < len(self._values) and self._values[idx] == old_value:
-                    self._values.pop(idx)
+    def __contains__(self, key: int) -> bool:
+        return key in self._current
+
+    def __len__(self) -> int:
+        return len(self._current)
 
     def Insert(self, key: int, value: float, alpha: int, pred_v_id: int):
+        current = self._current
         # If key exists, compare lexicographically similar to previous logic
-        if key in self._key_to_value:
-            old_value = self._key_to_value[key]
-            old_alpha, old_pred = self._value_to_keys[old_value][key]
+        old = current.get(key)
+        if old is not None:
+            old_value, old_alpha, old_pred, _ = old
             # If new is not better, ignore
             if value > old_value:
                 return
@@ -103,54 +126,294 @@ class SimplifiedLemma3_3_DataStructure:
                     return
                 if alpha == old_alpha and pred_v_id >= old_pred:
                     return
-            # remove old entry
-            self._remove_key(key)
 
-        # Add to value bucket
-        self._add_to_value_bucket(value, key, alpha, pred_v_id)
+        # The previous entry (if any) becomes stale once `_current` moves on
+        seq = self._seq = self._seq + 1
+        current[key] = (value, alpha, pred_v_id, seq)
+        heappush(self._heap, (value, seq, key))
 
     def BatchPrepend(self, L_items: List[Tuple[int, float, int, int]]):
         for key, value, alpha, pred_v_id in L_items:
             # These are expected to be small values; use Insert semantics
             self.Insert(key, value, alpha, pred_v_id)
 
+    def _drop_stale(self):
+        """Pop stale entries off the top so `_heap[0]`, if any, is live."""
+        heap = self._heap
+        current = self._current
+        while heap:
+            value, seq, key = heap[0]
+            live = current.get(key)
+            if live is not None and live[3] == seq:
+                return
+            heappop(heap)
+
     def Pull(self) -> Tuple[float, Set[int]]:
-        S_prime: Set[int] = set()
-        pulled_values: List[float] = []
-
-        # Iterate over smallest values and collect keys until M reached
-        while self._values and len(S_prime) < self.M:
-            smallest_value = self._values[0]
-            bucket = self._value_to_keys.get(smallest_value, {})
-            # take keys from this bucket
-            keys = list(bucket.keys())
-            for key in keys:
-                if len(S_prime) >= self.M:
-                    break
-                # remove key from structures
-                alpha_pred = bucket.pop(key)
-                self._key_to_value.pop(key, None)
-                S_prime.add(key)
-                pulled_values.append(smallest_value)
-            # if bucket emptied, remove value
-            if not bucket:
-                # remove bucket and the value from sorted list
-                del self._value_to_keys[smallest_value]
-                self._values.pop(0)
+        heap = self._heap
+        current = self._current
+        pulled: List[int] = []
+        last_value = None
+
+        if len(current) <= self.M:
+            # Every live key goes: order them with one sort instead of popping the heap
+            # (same (value, seq) order the pops would give) and drop the heap wholesale
+            for last_value, _, key in sorted((value, seq, key) for key, (value, _, _, seq) in current.items()):
+                pulled.append(key)
+            heap.clear()
+            current.clear()
+        else:
+            # Take the smallest live keys until M reached, skipping stale entries
+            M = self.M
+            while len(pulled) < M:
+                value, seq, key = heappop(heap)
+                live = current.get(key)
+                if live is None or live[3] != seq:
+                    continue
+                del current[key]
+                pulled.append(key)
+                last_value = value
 
         # Determine boundary x
-        if self._values:
-            x = self._values[0]
+        self._drop_stale()
+        if heap:
+            x = heap[0][0]
+        elif last_value is not None:
+            # Values come out in nondecreasing order, so this is the largest pulled
+            x = last_value + 1e-12
         else:
-            if pulled_values:
-                x = max(pulled_values) + 1e-12
-            else:
-                x = self.B
+            x = self.B
 
-        return x, S_prime
+        return x, set(pulled)
 
     def is_empty(self) -> bool:
-        return len(self._key_to_value) == 0
+        return not self._current
+
+
+# Released BMSSP structures, handed out again (after a reset) by later calls
+# so the recursion does not allocate a fresh heap and dict at every level
+_D_pool: List[SimplifiedLemma3_3_DataStructure] = []
+
+# --- Compiled kernels (NUMBA_KERNELS) ---
+
+# CSR as NumPy arrays for the kernels, built once per solve, plus an all-False
+# bool[n] scratch mask that a kernel may mark and must clear before returning;
+# set by solve_sssp_directed_real_weights in kernel mode
+_kernel_graph: Optional[CSRGraph] = None
+_kernel_mask = None
+
+if HAS_NUMBA:
+    @njit(cache=True, inline='always')
+    def _entry_less(d1, a1, v1, d2, a2, v2):
+        """Lexicographic (dist, alpha, vertex) order of the BaseCase heap entries."""
+        if d1 != d2:
+            return d1 < d2
+        if a1 != a2:
+            return a1 < a2
+        return v1 < v2
+
+    @njit(cache=True, inline='always')
+    def _improves(new_d, new_a, u, cur_d, cur_a, cur_p):
+        """
+        Relaxation test shared by the kernels: does (new_d, new_a) via `u` beat the current
+        (dist, alpha, pred) of a vertex? Composed from non-short-circuit `&`/`|` so it compiles
+        to straight-line compares and selects instead of a branch per tie-break level.
+        """
+        return (new_d < cur_d) | ((new_d == cur_d) & ((new_a < cur_a) | ((new_a == cur_a) & (u < cur_p))))
+
+    @njit(cache=True)
+    def _heappush(heap_d, heap_a, heap_v, size, d, a, v):
+        """Push (d, a, v) onto the heap held in three parallel arrays; returns the new size."""
+        i = size
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not _entry_less(d, a, v, heap_d[parent], heap_a[parent], heap_v[parent]):
+                break
+            heap_d[i] = heap_d[parent]
+            heap_a[i] = heap_a[parent]
+            heap_v[i] = heap_v[parent]
+            i = parent
+        heap_d[i] = d
+        heap_a[i] = a
+        heap_v[i] = v
+        return size + 1
+
+    @njit(cache=True)
+    def _heappop(heap_d, heap_a, heap_v, size):
+        """Pop the smallest entry; returns (d, a, v, new_size)."""
+        d, a, v = heap_d[0], heap_a[0], heap_v[0]
+        size -= 1
+        if size > 0:
+            # Sift the last entry down from the root
+            ld, la, lv = heap_d[size], heap_a[size], heap_v[size]
+            i = 0
+            while True:
+                c = 2 * i + 1
+                if c >= size:
+                    break
+                if c + 1 < size and _entry_less(heap_d[c + 1], heap_a[c + 1], heap_v[c + 1],
+                                                heap_d[c], heap_a[c], heap_v[c]):
+                    c += 1
+                if not _entry_less(heap_d[c], heap_a[c], heap_v[c], ld, la, lv):
+                    break
+                heap_d[i] = heap_d[c]
+                heap_a[i] = heap_a[c]
+                heap_v[i] = heap_v[c]
+                i = c
+            heap_d[i] = ld
+            heap_a[i] = la
+            heap_v[i] = lv
+        return d, a, v, size
+
+    @njit(cache=True)
+    def _base_case_kernel(B, seeds, indptr, indices, weights, d_hat, path_alpha, pred, k_param, in_U0):
+        """
+        BaseCase over CSR arrays, updating d_hat/path_alpha/pred in place.
+        Returns (B_prime, U) with U in the order vertices were finalized.
+        `in_U0` is an all-False bool[n] scratch mask, left all-False again.
+        """
+        # Sized for the seeds; grown below before a vertex's relaxations
+        cap = len(seeds) + 1
+        heap_d = np.empty(cap)
+        heap_a = np.empty(cap, dtype=np.int64)
+        heap_v = np.empty(cap, dtype=np.int64)
+        size = 0
+        for x in seeds:
+            size = _heappush(heap_d, heap_a, heap_v, size, d_hat[x], path_alpha[x], x)
+
+        U0 = np.empty(k_param + 1, dtype=np.int64)
+        candidates = np.empty(k_param + 1)
+        count = 0
+        while size > 0 and count < k_param + 1:
+            d, a, u, size = _heappop(heap_d, heap_a, heap_v, size)
+
+            # Stale entry: a better (dist, alpha) for u is already recorded
+            du = d_hat[u]
+            if d > du or (d == du and a > path_alpha[u]):
+                continue
+            if in_U0[u]:
+                continue
+            in_U0[u] = True
+            U0[count] = u
+            candidates[count] = d
+            count += 1
+
+            start, end = indptr[u], indptr[u + 1]
+            if size + end - start > len(heap_d):
+                # Grow the heap arrays to fit every push from this vertex
+                new_cap = max(2 * len(heap_d), size + end - start)
+                heap_d = np.concatenate((heap_d, np.empty(new_cap - len(heap_d))))
+                heap_a = np.concatenate((heap_a, np.empty(new_cap - len(heap_a), dtype=np.int64)))
+                heap_v = np.concatenate((heap_v, np.empty(new_cap - len(heap_v), dtype=np.int64)))
+            for i in range(start, end):
+                v = indices[i]
+                new_dist = d + weights[i]
+                new_alpha = a + 1
+                if new_dist < B:
+                    if _improves(new_dist, new_alpha, u, d_hat[v], path_alpha[v], pred[v]):
+                        d_hat[v] = new_dist
+                        path_alpha[v] = new_alpha
+                        pred[v] = u
+                        size = _heappush(heap_d, heap_a, heap_v, size, new_dist, new_alpha, v)
+
+        for j in range(count):
+            in_U0[U0[j]] = False
+
+        if count <= k_param:
+            return B, U0[:count].copy()
+        # Finalized in nondecreasing order, so the last one is the (k_param + 1)-th smallest
+        B_prime = candidates[count - 1]
+        return B_prime, U0[:count][candidates[:count] < B_prime]
+
+    @njit(cache=True)
+    def _relax_step_kernel(frontier, indptr, indices, weights, d_hat, path_alpha, pred, B, inclusive, seen):
+        """
+        One FindPivots relaxation step: a min-plus product of the weight matrix with d_hat,
+        restricted to the CSR rows of `frontier` and taken in frontier order.
+
+        Updates d_hat/path_alpha/pred in place exactly like the interpreted loop (later
+        frontier vertices see the updates of earlier ones) and returns the distinct heads
+        `v` found within the bound, in order of first hit, so the caller can rebuild the
+        same W and next-frontier sets. `seen` is the all-False scratch mask.
+        """
+        total = 0
+        for u in frontier:
+            total += indptr[u + 1] - indptr[u]
+        reached = np.empty(total, dtype=np.int64)
+        count = 0
+        for u in frontier:
+            base_d = d_hat[u]
+            new_alpha = path_alpha[u] + 1
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                new_dist = base_d + weights[e]
+                if _improves(new_dist, new_alpha, u, d_hat[v], path_alpha[v], pred[v]):
+                    d_hat[v] = new_dist
+                    path_alpha[v] = new_alpha
+                    pred[v] = u
+                if not seen[v] and (d_hat[v] <= B if inclusive else d_hat[v] < B):
+                    seen[v] = True
+                    reached[count] = v
+                    count += 1
+        for j in range(count):
+            seen[reached[j]] = False
+        return reached[:count]
+
+    @njit(cache=True)
+    def _relax_completed_kernel(sources, indptr, indices, weights, d_hat, path_alpha, pred):
+        """
+        BMSSP step 5: relax the out-edges of the completed `sources`, in order, updating
+        d_hat/path_alpha/pred in place. Returns the improvements as parallel arrays
+        (vertex, dist, alpha, pred) in the order they were made, for the caller to route
+        into D.
+        """
+        total = 0
+        for u in sources:
+            total += indptr[u + 1] - indptr[u]
+        upd_v = np.empty(total, dtype=np.int64)
+        upd_d = np.empty(total)
+        upd_a = np.empty(total, dtype=np.int64)
+        upd_u = np.empty(total, dtype=np.int64)
+        count = 0
+        for u in sources:
+            base_d = d_hat[u]
+            new_alpha = path_alpha[u] + 1
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                new_dist = base_d + weights[e]
+                if _improves(new_dist, new_alpha, u, d_hat[v], path_alpha[v], pred[v]):
+                    d_hat[v] = new_dist
+                    path_alpha[v] = new_alpha
+                    pred[v] = u
+                    upd_v[count] = v
+                    upd_d[count] = new_dist
+                    upd_a[count] = new_alpha
+                    upd_u[count] = u
+                    count += 1
+        return upd_v[:count], upd_d[:count], upd_a[:count], upd_u[:count]
+
+
+# Weight dtypes the kernels have been specialized for in this process
+_warmed_kernel_dtypes: Set[str] = set()
+
+
+def _warm_kernels(weight_dtype: str):
+    """
+    Compile (or load from the on-disk cache) the kernels for `weight_dtype` by
+    running them once on a one-vertex graph, so the first solve doesn't pay for
+    it in the middle of the recursion. No-op after the first call per dtype.
+    """
+    if weight_dtype in _warmed_kernel_dtypes:
+        return
+    indptr = np.zeros(2, dtype=np.int64)
+    indices = np.zeros(0, dtype=np.int32)
+    weights = np.zeros(0, dtype=weight_dtype)
+    d, a, p = np.zeros(1), np.zeros(1, dtype=np.int32), np.full(1, -1, dtype=np.int32)
+    seeds, mask = np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.bool_)
+    _base_case_kernel(1.0, seeds, indptr, indices, weights, d, a, p, 1, mask)
+    _relax_step_kernel(seeds, indptr, indices, weights, d, a, p, 1.0, True, mask)
+    _relax_completed_kernel(seeds, indptr, indices, weights, d, a, p)
+    _warmed_kernel_dtypes.add(weight_dtype)
+
 
 # --- Algorithm 2: Base Case of BMSSP (Mini Dijkstra) ---
 # PAPER REFERENCE: Algorithm 2 from "Breaking the Sorting Barrier" (Duan et al., 2025)
@@ -170,7 +433,7 @@ def BaseCase(B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]:
     Args:
         B: The upper bound for distances to consider.
         S: A set of seed vertices (may be singleton or multiple).
-        graph: The graph adjacency list.
+        graph: The graph as a CSR adjacency.
 
     Returns:
         A tuple `(B_prime, U)`, where `B_prime` is a new boundary and `U` is the set of
@@ -180,36 +443,39 @@ def BaseCase(B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]:
     - Explores up to k+1 vertices from sources S
     - If finds exactly k or fewer: B' = B, U = all found
     - If finds k+1 or more: B' = distance of (k+1)-th vertex, U = vertices with dist < B'
+
+    In NUMBA_KERNELS mode the whole loop runs in `_base_case_kernel`.
     """
+    if _kernel_graph is not None:
+        B_prime, U = _base_case_kernel(B, np.fromiter(S, np.int64, len(S)), *_kernel_graph,
+                                       d_hat, path_alpha, pred, k_param, _kernel_mask)
+        return B_prime, set(U.tolist())
+
+    indptr, indices, weights = graph
 
     # `U0` accumulates vertices whose true distances (relative to the seeds in `S` and `B`) are found.
     U0: Set[int] = set()
 
-    # Priority queue for Dijkstra's: (current_dist, current_path_alpha, vertex_id, pred_id_in_heap)
-    H: List[Tuple[float, int, int, int]] = []
-
+    # Priority queue for Dijkstra's: (current_dist, current_path_alpha, vertex_id).
+    # The predecessor is not part of the entry: entries for u with equal
+    # (dist, alpha) relax u identically and only the first is processed, so
+    # it never changes the outcome and would only widen every tuple.
     # Seed the heap with all vertices in S using their current global estimates.
-    for x in S:
-        x_pred = pred.get(x)
-        if x_pred is None:
-            x_pred = -1
-        heapq.heappush(H, (d_hat.get(x, float('inf')), path_alpha.get(x, float('inf')), x, x_pred))
+    H: List[Tuple[float, int, int]] = [(d_hat[x], path_alpha[x], x) for x in S]
+    heapq.heapify(H)
+
+    heappush, heappop = heapq.heappush, heapq.heappop
 
     # `candidates` temporarily stores distances of vertices added to `U0` before filtering by `B_prime`.
     candidates: Dict[int, float] = {}
 
     # Loop until the heap is empty or `k_param + 1` distinct vertices have been added to `U0`.
     while H and len(U0) < k_param + 1:
-        current_d, current_alpha, u, current_pred_u = heapq.heappop(H)
+        current_d, current_alpha, u = heappop(H)
 
         # Skip this entry if a shorter/better path to `u` has already been found and processed globally.
         # This handles "stale" entries in the heap from conceptual decrease-key operations.
-        actual_pred_u = pred.get(u)
-        if actual_pred_u is None:
-            actual_pred_u = -1
-        if current_d > d_hat.get(u, float('inf')) or \
-           (current_d == d_hat.get(u, float('inf')) and current_alpha > path_alpha.get(u, float('inf'))) or \
-           (current_d == d_hat.get(u, float('inf')) and current_alpha == path_alpha.get(u, float('inf')) and current_pred_u > actual_pred_u):
+        if current_d > d_hat[u] or (current_d == d_hat[u] and current_alpha > path_alpha[u]):
             continue
 
         # If `u` is already in `U0`, it means its shortest path has already been finalized in this base case.
@@ -220,34 +486,34 @@ def BaseCase(B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]:
         # Record its distance for later `B_prime` calculation
         candidates[u] = current_d
 
-        # Relax outgoing edges from `u`
-        for v, weight_uv in graph.get(u, {}).items():
-            new_dist = current_d + weight_uv
-            new_alpha = current_alpha + 1
+        # Relax outgoing edges from `u`, collecting the improved entries. Pop order only
+        # depends on the entries themselves, so they can be pushed one by one or, when
+        # they are a large share of the heap, merged in with a single heapify.
+        pending: List[Tuple[float, int, int]] = []
+        new_alpha = current_alpha + 1
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            new_dist = current_d + weights[e]
 
             # Only consider paths whose total distance is strictly less than `B`.
             if new_dist < B:
                 # Check relaxation condition `dÌ‚[u] + wuv <= dÌ‚[v]` and apply tie-breaking.
-                current_v_d = d_hat.get(v, float('inf'))
-                current_v_alpha = path_alpha.get(v, float('inf'))
-                # Use float('inf') for comparison if `pred[v]` is None
-                current_v_pred = pred.get(v, float('inf'))
-
-                update_needed = False
-                if new_dist < current_v_d:
-                    update_needed = True
-                elif new_dist == current_v_d:
-                    if new_alpha < current_v_alpha:  # Prefer shorter path in terms of number of edges
-                        update_needed = True
-                    elif new_alpha == current_v_alpha and u < current_v_pred:  # Tie-breaking on predecessor ID
-                        update_needed = True
-
-                if update_needed:
+                current_v_d = d_hat[v]
+                if new_dist < current_v_d or (new_dist == current_v_d and (
+                        # Prefer shorter path in terms of number of edges, then tie-break on predecessor ID
+                        new_alpha < path_alpha[v] or (new_alpha == path_alpha[v] and u < pred[v]))):
                     d_hat[v] = new_dist
                     path_alpha[v] = new_alpha
                     pred[v] = u
-                    # Push (dist, alpha, vertex, its_pred) to heap
-                    heapq.heappush(H, (new_dist, new_alpha, v, u))
+                    # Queue (dist, alpha, vertex) for the heap
+                    pending.append((new_dist, new_alpha, v))
+
+        if len(pending) > len(H) >> 1:
+            H.extend(pending)
+            heapq.heapify(H)
+        else:
+            for entry in pending:
+                heappush(H, entry)
 
     # Determine the returned `B_prime` and final `U` based on the size of `U0`.
     B_prime: float
@@ -257,16 +523,11 @@ def BaseCase(B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]:
         B_prime = B  # The boundary remains as the initial `B`.
         final_U = U0  # All found vertices are considered part of `U`.
     else:
-        # Otherwise (we found `k_param + 1` or more vertices), `B_prime` is the distance of the
+        # Otherwise (we found `k_param + 1` vertices), `B_prime` is the distance of the
         # `(k_param + 1)`-th smallest distance found in `U0`.
-        sorted_distances = sorted(candidates.values())
-        if len(sorted_distances) > k_param:
-            # The (k+1)-th smallest distance
-            B_prime = sorted_distances[k_param]
-        else:
-            # Fallback, should ideally not be reached if `len(U0) > k_param`.
-            # If it occurs, it indicates an edge case in exact `k+1` selection or distance ties.
-            B_prime = max(sorted_distances) if sorted_distances else B
+        # Pops come out in nondecreasing distance order and the loop stops at the
+        # `(k_param + 1)`-th vertex, so its distance (the last one recorded) is that value.
+        B_prime = current_d
 
         # `U` consists of vertices in `U0` whose distances are strictly less than `B_prime`.
         final_U = {v for v, dist in candidates.items() if dist < B_prime}
@@ -292,7 +553,7 @@ def FindPivots(B: float, S: Set[int], graph: Graph) -> Tuple[Set[int], Set[int]]
     Args:
         B: The upper bound for distances.
         S: The set of complete source vertices.
-        graph: The graph adjacency list.
+        graph: The graph as a CSR adjacency.
 
     Returns:
         A tuple `(P, W)`, where `P` is the set of pivot vertices, and `W` is the set of
@@ -303,6 +564,7 @@ def FindPivots(B: float, S: Set[int], graph: Graph) -> Tuple[Set[int], Set[int]]
     - Frontier W may not expand efficiently if graph has bottlenecks
     """
     global d_hat, pred, path_alpha, k_param
+    indptr, indices, weights = graph
 
     W: Set[int] = set(S)  # `W` initially contains all source vertices `S`.
 
@@ -311,49 +573,49 @@ def FindPivots(B: float, S: Set[int], graph: Graph) -> Tuple[Set[int], Set[int]]
 
     # Perform `k_param` steps of Bellman-Ford-like relaxation.
     # This phase updates global `d_hat` values for reachable vertices within the bound `B`.
+    inclusive = HEURISTICS_ENABLED and HEURISTICS_BOUNDARY_EQUALITY
     for i in range(k_param):  # `i` from 0 to `k_param - 1` for `k_param` steps
+        if _kernel_graph is not None:
+            # Relax the whole step in `_relax_step_kernel`; replaying its first hits through
+            # set() and update() gives the same sets as the add() calls below
+            reached = _relax_step_kernel(np.fromiter(Wi_current_step, np.int64, len(Wi_current_step)),
+                                         *_kernel_graph, d_hat, path_alpha, pred, B, inclusive,
+                                         _kernel_mask).tolist()
+            W.update(reached)
+            Wi_current_step = set(reached)
+            _instr(f"[FindPivots] after step={i} Wi_next_size={len(Wi_current_step)} W_size={len(W)}")
+            if len(W) > k_param * len(S):
+                P = set(S)
+                return P, W
+            continue
+
         # Vertices whose edges will be relaxed in the next step
         next_Wi: Set[int] = set()
         for u in Wi_current_step:
-            if u not in graph:
-                continue  # No outgoing edges from u
-            for v, weight_uv in graph[u].items():
-                new_dist = d_hat[u] + weight_uv
-                new_alpha = path_alpha[u] + 1
+            # `u`'s own estimate is invariant while its edges are relaxed
+            base_d = d_hat[u]
+            new_alpha = path_alpha[u] + 1
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                new_dist = base_d + weights[e]
 
                 # Apply relaxation condition `dÌ‚[u] + wuv <= dÌ‚[v]` with tie-breaking.
-                current_v_d = d_hat.get(v, float('inf'))
-                current_v_alpha = path_alpha.get(v, float('inf'))
-                # Using float('inf') for comparison if `pred[v]` is None
-                current_v_pred = pred.get(v, float('inf'))
-
-                update_needed = False
-                if new_dist < current_v_d:
-                    update_needed = True
-                elif new_dist == current_v_d:
-                    # Prefer shorter path (fewer edges)
-                    if new_alpha < current_v_alpha:
-                        update_needed = True
-                    elif new_alpha == current_v_alpha and u < current_v_pred:  # Tie-breaking on predecessor ID
-                        update_needed = True
-
-                if update_needed:
-                    d_hat[v] = new_dist
+                current_v_d = d_hat[v]
+                if new_dist < current_v_d or (new_dist == current_v_d and (
+                        # Prefer shorter path (fewer edges), then tie-break on predecessor ID
+                        new_alpha < path_alpha[v] or (new_alpha == path_alpha[v] and u < pred[v]))):
+                    d_hat[v] = current_v_d = new_dist
                     path_alpha[v] = new_alpha
                     pred[v] = u
 
                 # Add v to W and next_Wi if within bound, regardless of whether it was updated
                 # The vertex is "visited" during these k steps from S
-                if HEURISTICS_ENABLED and HEURISTICS_BOUNDARY_EQUALITY:
-                    within_bound = d_hat.get(v, float('inf')) <= B
-                else:
-                    within_bound = d_hat.get(v, float('inf')) < B
-                if within_bound:
+                if current_v_d <= B if inclusive else current_v_d < B:
                     next_Wi.add(v)
                     W.add(v)
 
         # Move to the next set of vertices for relaxation.
-        Wi_current_step = next_Wi.copy()
+        Wi_current_step = next_Wi
         _instr(f"[FindPivots] after step={i} Wi_next_size={len(Wi_current_step)} W_size={len(W)}")
 
         # Check condition: if `|W| > k_param * |S|`, then `S` itself becomes the pivot set `P`.
@@ -365,16 +627,10 @@ def FindPivots(B: float, S: Set[int], graph: Graph) -> Tuple[Set[int], Set[int]]
     # Now, identify pivots `P`. A vertex `u` in `S` is a pivot if it's the root of a shortest path
     # tree (implied by `d_hat` and `pred` values) that contains at least `k_param` vertices within `W`.
 
-    # Build an adjacency list representing the implicit forest `F` (formed by `(pred[v], v)` edges).
-    # This forest connects vertices within `W` back to their predecessors, which may be in `S` or `W`.
-    F_adj: Dict[int, List[int]] = defaultdict(list)
-    for v_node in W:
-        p_node = pred.get(v_node)
-        # Add edge (p_node, v_node) to F if `p_node` is relevant (in `S` or `W`).
-        if p_node is not None and (p_node in W or p_node in S):
-            F_adj[p_node].append(v_node)
-
-    P: Set[int] = set()  # The set of identified pivots.
+    # The implicit forest `F` is formed by the `(pred[v], v)` edges with both ends in `W`. Rather
+    # than building its child lists and running a DFS per root, accumulate every subtree size in
+    # one post-order pass: peel vertices whose children are all counted and add each one's size
+    # to its parent.
 
     # *** CRITICAL FIX (Bug #1 from analysis) ***
     # ORIGINAL BUG: Used a shared `nodes_already_counted_in_pivot_dfs` set across all pivots,
@@ -383,56 +639,85 @@ def FindPivots(B: float, S: Set[int], graph: Graph) -> Tuple[Set[int], Set[int]]
     # CORRECT BEHAVIOR: Each pivot's subtree should be counted independently. A node can appear
     # in multiple pivot subtrees via different paths in the implicit forest F.
     # 
-    # FIX: Create a fresh visited set for each pivot's DFS to count its subtree independently.
-
-    def dfs_calculate_subtree_size(current_node: int, visited_for_this_pivot: Set[int]) -> int:
-        """
-        Helper function to calculate the size of a subtree within the forest `F` rooted at `current_node`.
-        Uses a per-pivot visited set to allow nodes to be counted in multiple pivot subtrees.
-        
-        Args:
-            current_node: Root of the current subtree
-            visited_for_this_pivot: Set tracking nodes already visited in THIS pivot's DFS
-        
-        Returns:
-            Size of the subtree rooted at current_node
-        """
-        if current_node in visited_for_this_pivot:
-            return 0  # Node already visited in this particular pivot's subtree traversal
-
-        visited_for_this_pivot.add(current_node)
-        size = 1  # Count the `current_node` itself
-
-        for neighbor in F_adj[current_node]:
-            size += dfs_calculate_subtree_size(neighbor, visited_for_this_pivot)
-
-        return size
-
-    # Iterate through each vertex in `S` that is also part of `W` (meaning it was processed).
-    for s_root in S:
-        if s_root in W:
-            # Create a fresh visited set for this pivot's subtree calculation
-            visited_for_this_pivot: Set[int] = set()
-            
-            # Calculate the size of the subtree rooted at `s_root` within `F`.
-            # This accounts for all reachable nodes from `s_root` via `pred` links within `W`.
-            subtree_size = dfs_calculate_subtree_size(s_root, visited_for_this_pivot)
-
-            # If the subtree size is `k_param` or more, `s_root` is a pivot.
-            if subtree_size >= k_param:
-                P.add(s_root)
+    # FIX: Sizes are summed up the whole forest, so a root nested under another root still
+    # contributes its vertices to both subtrees.
+    subtree_size: Dict[int, int] = dict.fromkeys(W, 1)
+    # Children of each vertex not yet added into its size
+    pending: Dict[int, int] = {}
+    for v_node in W:
+        p_node = pred[v_node]
+        if p_node in subtree_size:
+            pending[p_node] = pending.get(p_node, 0) + 1
+
+    ready = [v_node for v_node in W if v_node not in pending]
+    while ready:
+        v_node = ready.pop()
+        p_node = pred[v_node]
+        if p_node in subtree_size:
+            subtree_size[p_node] += subtree_size[v_node]
+            pending[p_node] -= 1
+            if not pending[p_node]:
+                ready.append(p_node)
+
+    # Vertices still pending sit on a pred cycle (only possible with zero-weight cycles). Every
+    # member's subtree is then the whole component, i.e. the cycle plus everything hanging off it.
+    for v_node, left in pending.items():
+        if left:
+            cycle = [v_node]
+            p_node = pred[v_node]
+            while p_node != v_node:
+                cycle.append(p_node)
+                p_node = pred[p_node]
+            component_size = sum(subtree_size[c] for c in cycle)
+            for c in cycle:
+                subtree_size[c] = component_size
+                pending[c] = 0
+
+    # A vertex in `S` is a pivot if its subtree in `F` has `k_param` vertices or more.
+    P: Set[int] = {s_root for s_root in S if subtree_size[s_root] >= k_param}
 
     return P, W
 
 
 def BMSSP(l: int, B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]:
-    # Algorithm 3: Bounded Multi-Source Shortest Path (BMSSP)
-    global d_hat, pred, path_alpha, k_param, t_param, N_vertices
+    """
+    Algorithm 3: Bounded Multi-Source Shortest Path (BMSSP).
 
+    Runs the recursion without nesting Python calls: every level above the base case is a
+    `_bmssp_frame` generator kept on an explicit stack. A frame yields `(l - 1, Bi, Si)` where
+    the algorithm recurses and is resumed with that sub-call's `(B', U)`; base-case requests are
+    answered with `BaseCase` directly.
+    """
     # Base case of the recursion: when level `l` is 0.
     if l == 0:
         return BaseCase(B, S, graph)
 
+    frames = [_bmssp_frame(l, B, S, graph)]
+    result = None  # Sub-call result to resume the top frame with (None starts a new frame)
+    while True:
+        try:
+            child_l, child_B, child_S = frames[-1].send(result)
+        except StopIteration as finished:
+            frames.pop()
+            if not frames:
+                return finished.value
+            result = finished.value
+            continue
+        if child_l == 0:
+            result = BaseCase(child_B, child_S, graph)
+        else:
+            frames.append(_bmssp_frame(child_l, child_B, child_S, graph))
+            result = None
+
+
+def _bmssp_frame(l: int, B: float, S: Set[int], graph: Graph):
+    # One level (l >= 1) of Algorithm 3; the recursive call of Step 4 is delegated to `BMSSP`'s
+    # frame stack by yielding its arguments
+    global d_hat, pred, path_alpha, k_param, t_param, N_vertices
+
+    indptr, indices, weights = graph
+    relax_insert = HEURISTICS_ENABLED and HEURISTICS_RELAX_INSERT
+
     # Step 1: Find Pivots. This identifies `P` (a smaller set of key sources) and `W` (processed vertices).
     P, W = FindPivots(B, S, graph)
     _instr(f"[BMSSP] level={l} B={B} |S|={len(S)} |P|={len(P)} |W|={len(W)}")
@@ -445,25 +730,30 @@ def BMSSP(l: int, B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]
         M_param = max(64, 2**((l - 1) * t_param)) if (l - 1) * t_param >= 0 else 64
     else:
         M_param = 2**((l - 1) * t_param) if (l - 1) * t_param >= 0 else 1
-    D = SimplifiedLemma3_3_DataStructure(M_param, B)
+    if _D_pool:
+        D = _D_pool.pop()
+        D.reset(M_param, B)
+    else:
+        D = SimplifiedLemma3_3_DataStructure(M_param, B)
 
     # Insert the identified pivots `P` into `D`.
     for x in P:
         # `d_hat[x]` for `x` in `P` is assumed to be its true (complete) distance from source `s`.
-        D.Insert(x, d_hat[x], path_alpha[x], pred.get(x, -1))
+        D.Insert(x, d_hat[x], path_alpha[x], pred[x])
 
     # Optional heuristic: seed D with neighbors from W to bootstrap propagation
     if HEURISTICS_ENABLED and HEURISTICS_SEEDING:
         seeded = 0
+        inf = float('inf')
         for w in list(W):
-            if w in graph:
-                for v_nb, w_nb in graph[w].items():
-                    if v_nb not in D._key_to_value:
-                        dv = d_hat.get(v_nb, float('inf'))
-                        if dv != float('inf'):
-                            D.Insert(v_nb, dv, path_alpha.get(v_nb, 0), pred.get(v_nb, -1))
-                            seeded += 1
-        _instr(f"[BMSSP Seed] seeded_neighbors_from_W={seeded} D_keys_after_seed={len(D._key_to_value)}")
+            for e in range(indptr[w], indptr[w + 1]):
+                v_nb = indices[e]
+                if v_nb not in D:
+                    dv = d_hat[v_nb]
+                    if dv != inf:
+                        D.Insert(v_nb, dv, path_alpha[v_nb], pred[v_nb])
+                        seeded += 1
+        _instr(f"[BMSSP Seed] seeded_neighbors_from_W={seeded} D_keys_after_seed={len(D)}")
 
     # Initialize variables for the main loop of this `BMSSP` call.
     if not P:
@@ -500,101 +790,102 @@ def BMSSP(l: int, B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]
         Bi, Si = D.Pull()
         _instr(f"[BMSSP] level={l} iter={iteration_count} Pulled Bi={Bi} Si_count={len(Si)} M_param={M_param}")
         
-        # Safety: detect if we're pulling the same vertices repeatedly
-        Si_set = set(Si)
-        if Si_set.issubset(processed_vertices):
+        # Safety: detect if we're pulling the same vertices repeatedly (nothing new was added)
+        seen_before = len(processed_vertices)
+        processed_vertices.update(Si)
+        if len(processed_vertices) == seen_before:
             stall_count += 1
             if stall_count > 5:
                 _instr(f"[BMSSP] level={l} BREAK: Pulling same {len(Si)} vertices repeatedly (stall={stall_count})")
                 break
         else:
             stall_count = 0
-            processed_vertices.update(Si_set)
         last_Bi = Bi
 
         # Heuristic adjustment for tiny Bi values
         if HEURISTICS_ENABLED and HEURISTICS_ADJUST_BI and Bi < 1e-9:
             min_pos = float('inf')
             for u_si in Si:
-                for v_nb, w_nb in graph.get(u_si, {}).items():
-                    cand = d_hat.get(u_si, float('inf')) + w_nb
-                    if cand > d_hat.get(u_si, float('inf')) and cand < min_pos:
+                for w_nb in weights[indptr[u_si]:indptr[u_si + 1]]:
+                    cand = d_hat[u_si] + w_nb
+                    if cand > d_hat[u_si] and cand < min_pos:
                         min_pos = cand
             if min_pos < float('inf'):
                 _instr(f"[BMSSP AdjustBi] original Bi={Bi} adjusted to {min_pos}")
                 Bi = min_pos
             else:
-                max_pulled = max((d_hat.get(u_si, 0.0) for u_si in Si), default=0.0)
+                max_pulled = max((d_hat[u_si] for u_si in Si), default=0.0)
                 Bi = max_pulled + 1e-12
                 _instr(f"[BMSSP AdjustBi] fallback Bi={Bi}")
 
         # Step 4: Make a recursive call to `BMSSP` for the next lower level (`l-1`).
         # The recursive call uses `Bi` as its upper bound and `Si` as its source set.
-        B_prime_i, Ui = BMSSP(l - 1, Bi, Si, graph)
+        B_prime_i, Ui = yield l - 1, Bi, Si
         # Add the complete vertices found by the recursive call to `current_U`.
         current_U.update(Ui)
         last_B_prime_i = B_prime_i  # Update the last recorded `B'_i`.
 
-        # Step 5: Relax edges from all newly completed vertices in `Ui`.
-        # Propagate distance updates.
-        # Collects items for batch prepending
-        K_batch_prepend: List[Tuple[int, float, int, int]] = []
-
-        for u_completed in Ui:
-            if u_completed not in graph:
-                continue  # No outgoing edges
-            for v_neighbor, weight_uv in graph[u_completed].items():
-                new_dist = d_hat[u_completed] + weight_uv
+        # Steps 5 and 6, fused: relax edges from all newly completed vertices in `Ui` and place
+        # every updated neighbor into `D` right away. Without the relax-insert heuristic only
+        # values in `[Bi, B)` (plain insert) or `[B'_i, Bi)` (the paper's batch prepend) go in.
+        # Prepended values all lie below anything else in `D` and keep their relative order,
+        # so inserting them as they are found is the same as batching them after the loop.
+        prepended = 0
+
+        if _kernel_graph is not None:
+            # Relax in `_relax_completed_kernel`, then route its updates as the loop below does
+            updates = zip(*(arr.tolist() for arr in _relax_completed_kernel(
+                np.fromiter(Ui, np.int64, len(Ui)), *_kernel_graph, d_hat, path_alpha, pred)))
+            for v_neighbor, new_dist, new_alpha, u_completed in updates:
+                if relax_insert:
+                    D.Insert(v_neighbor, new_dist, new_alpha, u_completed)
+                elif B_prime_i <= new_dist < B:
+                    D.Insert(v_neighbor, new_dist, new_alpha, u_completed)
+                    if new_dist < Bi:
+                        prepended += 1
+        else:
+            for u_completed in Ui:
+                # `u_completed`'s own estimate is invariant while its edges are relaxed
+                base_d = d_hat[u_completed]
                 new_alpha = path_alpha[u_completed] + 1
+                for e in range(indptr[u_completed], indptr[u_completed + 1]):
+                    v_neighbor = indices[e]
+                    new_dist = base_d + weights[e]
+
+                    # Apply relaxation and tie-breaking rules, similar to Dijkstra's.
+                    current_v_d = d_hat[v_neighbor]
+                    if new_dist > current_v_d:
+                        continue
+                    if new_dist == current_v_d:
+                        current_v_alpha = path_alpha[v_neighbor]
+                        if new_alpha > current_v_alpha or (
+                                new_alpha == current_v_alpha and u_completed >= pred[v_neighbor]):
+                            continue
 
-                # Apply relaxation and tie-breaking rules, similar to Dijkstra's.
-                current_v_d = d_hat.get(v_neighbor, float('inf'))
-                current_v_alpha = path_alpha.get(v_neighbor, float('inf'))
-                current_v_pred = pred.get(v_neighbor, float('inf'))
-
-                update_needed = False
-                if new_dist < current_v_d:
-                    update_needed = True
-                elif new_dist == current_v_d:
-                    if new_alpha < current_v_alpha:
-                        update_needed = True
-                    elif new_alpha == current_v_alpha and u_completed < current_v_pred:
-                        update_needed = True
-
-                if update_needed:
                     d_hat[v_neighbor] = new_dist
                     path_alpha[v_neighbor] = new_alpha
                     pred[v_neighbor] = u_completed
 
                     # Heuristic: relax insertion may place all updated neighbors into D
-                    if HEURISTICS_ENABLED and HEURISTICS_RELAX_INSERT:
-                        D.Insert(v_neighbor, d_hat[v_neighbor], path_alpha[v_neighbor], pred[v_neighbor])
-                    else:
-                        # Distinguish where to place `v_neighbor` based on its new distance.
-                        # If distance falls into the current `[Bi, B)` range, directly insert to `D`.
-                        if Bi <= new_dist < B:
-                            D.Insert(
-                                v_neighbor, d_hat[v_neighbor], path_alpha[v_neighbor], pred[v_neighbor])
-                        # If distance falls into the `[B'_i, Bi)` range, add to `K` for batch prepending.
-                        elif B_prime_i <= new_dist < Bi:
-                            K_batch_prepend.append(
-                                (v_neighbor, d_hat[v_neighbor], path_alpha[v_neighbor], pred[v_neighbor]))
-
-        # Step 6: `BatchPrepend` collected items to `D`.
-        # This includes vertices from `K_batch_prepend` and any vertices from `Si`
-        # whose true distances (`d_hat[x_si]`) are now confirmed to be in the `[B'_i, Bi)` range.
-        batch_items_to_add: List[Tuple[int, float, int, int]] = list(
-            K_batch_prepend)
+                    if relax_insert:
+                        D.Insert(v_neighbor, new_dist, new_alpha, u_completed)
+                    # Otherwise only distances in `[Bi, B)` or `[B'_i, Bi)`, i.e. `[B'_i, B)`
+                    elif B_prime_i <= new_dist < B:
+                        D.Insert(v_neighbor, new_dist, new_alpha, u_completed)
+                        if new_dist < Bi:
+                            prepended += 1
+
+        # The rest of Step 6: vertices from `Si` whose true distances (`d_hat[x_si]`) are now
+        # confirmed to be in the `[B'_i, Bi)` range go back into `D`, after the items above.
         for x_si in Si:
             # `x_si` was pulled from `D` but its precise distance was finalized by `BMSSP(l-1, Bi, Si)`.
             # If `d(x_si)` (which is now `d_hat[x_si]`) falls within `[B'_i, Bi)`, it needs to be "re-inserted"
             # at a higher priority for the current `BMSSP` call.
-            if d_hat.get(x_si, float('inf')) >= B_prime_i and d_hat.get(x_si, float('inf')) < Bi:
-                batch_items_to_add.append(
-                    (x_si, d_hat[x_si], path_alpha[x_si], pred.get(x_si, -1)))
+            if d_hat[x_si] >= B_prime_i and d_hat[x_si] < Bi:
+                D.Insert(x_si, d_hat[x_si], path_alpha[x_si], pred[x_si])
+                prepended += 1
 
-        D.BatchPrepend(batch_items_to_add)
-        _instr(f"[BMSSP] level={l} After BatchPrepend: batch_added={len(batch_items_to_add)} current_U_size={len(current_U)} D_keys={len(D._key_to_value)}")
+        _instr(f"[BMSSP] level={l} After BatchPrepend: batch_added={prepended} current_U_size={len(current_U)} D_keys={len(D)}")
 
     # Determine the final `B_prime` to be returned by this `BMSSP` call.
     final_return_B_prime: float
@@ -609,48 +900,184 @@ def BMSSP(l: int, B: float, S: Set[int], graph: Graph) -> Tuple[float, Set[int]]
     # that are complete (`d_hat[x_w]` is true distance) and within the `final_return_B_prime`.
     # Vertices in `W` are already complete (true distances found) due to `FindPivots` properties.
     for x_w in W:
-        if d_hat.get(x_w, float('inf')) < final_return_B_prime:
+        if d_hat[x_w] < final_return_B_prime:
             current_U.add(x_w)
 
+    _D_pool.append(D)
     return final_return_B_prime, current_U
 
+# --- Small-graph fast path ---
+
+# Graphs with at most this many vertices are solved by a plain Dijkstra
+# (`_dijkstra_small`) instead of BMSSP, skipping the recursion and its
+# per-level structures (about 10x faster at n <= 256). 0 (the default) keeps
+# BMSSP for every size, as experiments comparing the two need.
+SMALL_N_DIJKSTRA = 0
+
+
+def _dijkstra_small(source: int, graph: Graph):
+    """
+    Full Dijkstra from `source` over the initialized global state, with the
+    same (dist, alpha, pred) tie-break as BaseCase. The result is exact, so
+    it can differ from BMSSP's where BMSSP leaves estimates unsettled.
+    """
+    indptr, indices, weights = graph
+    H: List[Tuple[float, int, int]] = [(0.0, 0, source)]
+    done = [False] * len(d_hat)
+    while H:
+        current_d, current_alpha, u = heappop(H)
+        if done[u]:
+            continue
+        done[u] = True
+        new_alpha = current_alpha + 1
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            new_dist = current_d + weights[e]
+            current_v_d = d_hat[v]
+            if new_dist < current_v_d or (new_dist == current_v_d and (
+                    new_alpha < path_alpha[v] or (new_alpha == path_alpha[v] and u < pred[v]))):
+                d_hat[v] = new_dist
+                path_alpha[v] = new_alpha
+                pred[v] = u
+                heappush(H, (new_dist, new_alpha, v))
+
+
 # --- Main SSSP Algorithm Entry Point ---
 
+# Memoized solves per (edges object, n, source, weight dtype, mode and heuristic
+# flags), for loops that re-query one graph. Off unless set > 0, since timing
+# loops call the solver repeatedly on purpose. Like hybrid_sssp's CSR cache,
+# entries keep the edges object alive (so its id is not reused), and edges must
+# not be mutated in place between calls.
+SOLVE_CACHE_SIZE = 0
+_solve_cache: Dict[Tuple, Tuple[Any, Any, 'SSSPResult', Any]] = {}
 
-def solve_sssp_directed_real_weights(n_val: int, m_val: int, edges: List[Tuple[int, int, float]], source: int) -> Dict[int, float]:
-    # Implements the O(m log^(2/3) n)-time SSSP algorithm from Duan et al. (2025)
-    global d_hat, pred, path_alpha, k_param, t_param, N_vertices
 
-    N_vertices = n_val  # Store the total number of vertices globally.
+def clear_solve_cache() -> None:
+    """Drop all memoized solves (see SOLVE_CACHE_SIZE)."""
+    _solve_cache.clear()
+
+
+class SSSPResult(NamedTuple):
+    """
+    Final solver state of one run, returned by
+    `solve_sssp_directed_real_weights(..., return_state=True)`. `d_hat` and
+    `path_alpha` are lists, or NumPy arrays in NUMBA_KERNELS mode (where an
+    unreached vertex has path_alpha ALPHA_UNSET instead of inf).
+    """
+    d_hat: Sequence[float]
+    path_alpha: Sequence[Union[int, float]]
+    k_param: int
+    t_param: int
+    n: int
+
+
+def _build_solver_csr(edges, n: int) -> CSRGraph:
+    """
+    CSR adjacency (plain lists) for the solver. A repeated (u, v) keeps the
+    position of its first occurrence and the weight of its last one; rows keep
+    input order otherwise.
 
-    # Initialize global state for the SSSP problem.
-    d_hat.clear()
-    pred.clear()
-    path_alpha.clear()
+    A structured edge array (graph_generator.EDGE_DTYPE) goes through
+    graph_generator.build_csr, which applies the same rule with NumPy sorts
+    instead of a Python pass over every edge.
+    """
+    if HAS_NUMPY and isinstance(edges, np.ndarray):
+        return CSRGraph(*(part.tolist() for part in build_csr(edges, n)))
 
-    # Build the graph adjacency list and initialize all vertex distances to infinity.
-    graph: Dict[int, Dict[int, float]] = defaultdict(dict)
+    # Edges are grouped per source through a dict first, so a repeated (u, v)
+    # keeps its first position and its last weight.
+    adjacency: Dict[int, Dict[int, float]] = defaultdict(dict)
     for u, v, weight in edges:
-        graph[u][v] = weight
-        # Ensure all vertices referenced in edges are initialized.
-        # It's better to iterate through `range(N_vertices)` to include isolated vertices too.
+        adjacency[u][v] = weight
+    row_ends = [0] * (n + 1)
+    indices: List[int] = []
+    weights: List[float] = []
+    for u in sorted(adjacency):
+        row = adjacency[u]
+        indices.extend(row)
+        weights.extend(row.values())
+        row_ends[u + 1] = len(indices)
+    # Vertices without out-edges end where the previous row ended
+    return CSRGraph(list(accumulate(row_ends, max)), indices, weights)
+
+
+
+def solve_sssp_directed_real_weights(n_val: int, m_val: int, edges: List[Tuple[int, int, float]], source: int,
+                                     weight_dtype: str = 'float64', return_state: bool = False,
+                                     dense: bool = False) -> Any:
+    # Implements the O(m log^(2/3) n)-time SSSP algorithm from Duan et al. (2025)
+    # `edges` may also be a structured array with graph_generator.EDGE_DTYPE fields,
+    # or a CSRGraph from build_graph (see also `solve`).
+    # `weight_dtype='float32'` quantizes the edge weights to single precision: the
+    # NUMBA_KERNELS CSR then stores them as float32 (half the weight traffic), and
+    # the interpreted path uses the same rounded values so both modes agree.
+    # Distances are still accumulated in double precision, since the Python-side
+    # boundary arithmetic (`+ 1e-12` nudges, `< Bi` tests) needs it; sums of
+    # rounded weights can differ from float64 weights in the last ~7 digits.
+    # `return_state=True` returns (distances, SSSPResult) so callers such as
+    # scripts/sssp_diagnostics.py need not read this module's globals.
+    # `dense=True` returns the distances as the solver's d_hat itself (a list,
+    # or a float64 array in NUMBA_KERNELS mode; inf = unreachable) instead of
+    # building a {vertex: distance} dict of the reachable vertices.
+    global d_hat, pred, path_alpha, k_param, t_param, N_vertices, _kernel_graph, _kernel_mask
+    if weight_dtype not in ('float64', 'float32'):
+        raise ValueError(f"weight_dtype must be 'float64' or 'float32', got {weight_dtype!r}")
+    if n_val and not 0 <= source < n_val:
+        raise ValueError(f"source {source} is not a vertex of a graph with {n_val} vertices")
+
+    cache_key = None
+    if SOLVE_CACHE_SIZE > 0:
+        cache_key = (id(edges), n_val, source, weight_dtype, dense, NUMBA_KERNELS and HAS_NUMBA, SMALL_N_DIJKSTRA,
+                     HEURISTICS_ENABLED,
+                     HEURISTICS_SEEDING, HEURISTICS_RELAX_INSERT, HEURISTICS_LARGE_M,
+                     HEURISTICS_BOUNDARY_EQUALITY, HEURISTICS_ADJUST_BI)
+        entry = _solve_cache.get(cache_key)
+        if entry is not None and entry[0] is edges:
+            # Restore the module state of that run too, then hand out a copy
+            _, result_distances, state, pred = entry
+            d_hat, path_alpha, k_param, t_param, N_vertices = state
+            result_distances = result_distances.copy()
+            return (result_distances, state) if return_state else result_distances
 
-    # Initialize d_hat, path_alpha, and pred for all vertices
-    for v_id in range(N_vertices):
-        d_hat[v_id] = float('inf')
-        path_alpha[v_id] = float('inf')
-        pred[v_id] = None
+    N_vertices = n_val  # Store the total number of vertices globally.
+
+    # A CSRGraph (see build_graph) is used as given, so sweeps over sources
+    # build it once
+    graph = edges if isinstance(edges, CSRGraph) else _build_solver_csr(edges, N_vertices)
+    if weight_dtype == 'float32':
+        graph = graph._replace(weights=array('f', graph.weights).tolist())
+
+    # Initialize global state for the SSSP problem: every vertex (isolated
+    # ones included) starts unreached. Fresh lists/arrays are bound to the
+    # globals, so read them as `sssp_concept.d_hat` etc. rather than importing them.
+    if NUMBA_KERNELS and HAS_NUMBA:
+        _warm_kernels(weight_dtype)
+        d_hat = np.full(N_vertices, np.inf)
+        path_alpha = np.full(N_vertices, ALPHA_UNSET, dtype=np.int32)
+        pred = np.full(N_vertices, -1, dtype=np.int32)
+        _kernel_graph = CSRGraph(np.asarray(graph.indptr, dtype=np.int64), np.asarray(graph.indices, dtype=np.int32),
+                                 np.asarray(graph.weights, dtype=weight_dtype))
+        _kernel_mask = np.zeros(N_vertices, dtype=np.bool_)
+    else:
+        d_hat = [float('inf')] * N_vertices
+        path_alpha = [float('inf')] * N_vertices
+        pred = [-1] * N_vertices
+        _kernel_graph = None
 
     # Initialize the source vertex `s` with distance 0 and path length 0.
-    d_hat[source] = 0.0
-    path_alpha[source] = 0
+    # An empty graph has no source; everything below then leaves the state empty.
+    if N_vertices:
+        d_hat[source] = 0.0
+        path_alpha[source] = 0
 
     # Calculate parameters `k` and `t` based on `n` (total number of vertices).
     # `log^(1/3) n` means (log base 2 of n)^(1/3).
     # Ensure `n` is at least 2 for logarithm calculations to be meaningful.
     n_for_log_calc = max(2, N_vertices)
-    k_param = math.floor(math.log(n_for_log_calc, 2)**(1/3))
-    t_param = math.floor(math.log(n_for_log_calc, 2)**(2/3))
+    log2_n = math.log2(n_for_log_calc)
+    k_param = math.floor(log2_n**(1/3))
+    t_param = math.floor(log2_n**(2/3))
 
     # Ensure `k_param` and `t_param` are at least 1 to avoid issues like division by zero
     # or creating zero-sized data structures or iterations.
@@ -658,17 +1085,54 @@ def solve_sssp_directed_real_weights(n_val: int, m_val: int, edges: List[Tuple[i
     t_param = max(1, t_param)
 
     # Calculate the maximum recursion level `l_max_level` for the top-level call.
-    l_max_level = math.ceil(math.log(n_for_log_calc, 2) /
-                            t_param) if n_for_log_calc > 1 else 0
+    l_max_level = math.ceil(log2_n / t_param) if n_for_log_calc > 1 else 0
 
-    # Make the main call to the `BMSSP` algorithm.
-    # The initial call uses the highest level, the source vertex `s`, and an infinite upper bound.
-    final_boundary, final_complete_vertices_U = BMSSP(
-        l_max_level, float('inf'), {source}, graph)
+    if N_vertices == 0:
+        pass  # Empty graph: nothing to solve
+    elif N_vertices <= SMALL_N_DIJKSTRA:
+        _dijkstra_small(source, graph)
+    else:
+        # Make the main call to the `BMSSP` algorithm.
+        # The initial call uses the highest level, the source vertex `s`, and an infinite upper bound.
+        final_boundary, final_complete_vertices_U = BMSSP(
+            l_max_level, float('inf'), {source}, graph)
+    # Drop the pooled structures so their contents do not outlive the solve
+    _D_pool.clear()
 
     # According to the paper, at the top level call, `U` will contain all vertices,
     # and their shortest paths will have been found (assuming all vertices are reachable from `s`).
 
     # Filter `d_hat` to include only reachable vertices with finite distances.
-    result_distances = {v: d_hat[v] for v in range(N_vertices) if d_hat[v] != float('inf')}
-    return result_distances
\ No newline at end of file
+    if dense:
+        result_distances = d_hat
+    elif _kernel_graph is not None:
+        reached = np.flatnonzero(d_hat != np.inf)
+        result_distances = dict(zip(reached.tolist(), d_hat[reached].tolist()))
+    else:
+        inf = float('inf')
+        result_distances = {v: d for v, d in enumerate(d_hat) if d != inf}
+    state = SSSPResult(d_hat, path_alpha, k_param, t_param, N_vertices)
+    if cache_key is not None:
+        if len(_solve_cache) >= SOLVE_CACHE_SIZE:
+            del _solve_cache[next(iter(_solve_cache))]
+        _solve_cache[cache_key] = (edges, result_distances.copy(), state, pred)
+    if return_state:
+        return result_distances, state
+    return result_distances
+
+
+def build_graph(n: int, edges) -> Graph:
+    """
+    The solver's CSR for `edges` (tuples or an EDGE_DTYPE array) on `n`
+    vertices, deduplicated as a solve would. Build it once and pass it to
+    `solve` for each source instead of rebuilding it on every call.
+    """
+    return _build_solver_csr(edges, n)
+
+
+def solve(graph: Graph, source: int, **kwargs) -> Any:
+    """
+    `solve_sssp_directed_real_weights` on a graph from `build_graph`; keyword
+    arguments (weight_dtype, return_state, dense) are passed through.
+    """
+    return solve_sssp_directed_real_weights(graph.n, len(graph.indices), graph, source, **kwargs)